@@ -30,9 +30,17 @@ def create_app(config_override=None):
             DebugToolbarExtension(app)
         app.config['TEMPLATES_AUTO_RELOAD'] = True
     
-    from .routes import bp
+    from .routes import bp, warm_up_sentinels
     app.register_blueprint(bp)
 
+    # 预先创建各哨兵组客户端，避免首次抓取时冷启动
+    if not app.config.get('TESTING'):
+        warm_up_sentinels()
+
+    # 进程级共享采集线程池，随应用创建
+    from .executor import get_shared_executor
+    app.extensions['kvdb_executor'] = get_shared_executor()
+
     @app.context_processor
     def inject_template_globals():
         web_ui_config = Config.get_web_ui_config()
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import threading
+
+import redis
+import redis.asyncio
+
+from .pool import ConnectionPoolRegistry
+from .sentinel import ENGINE_KVROCKS, ENGINE_REDIS
+
+
+class AsyncCollectionEngine:
+    """基于 redis.asyncio 的节点采集引擎，在独立事件循环线程中按信号量并发采集。"""
+
+    def __init__(self, sentinel, concurrency=200, node_deadline=8):
+        self.sentinel = sentinel
+        self.concurrency = concurrency
+        self.node_deadline = node_deadline
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self.pool_registry = ConnectionPoolRegistry(
+            sentinel.connect_timeout,
+            sentinel.read_timeout,
+            sentinel.pool_registry.idle_timeout,
+            pool_class=redis.asyncio.ConnectionPool,
+            client_class=redis.asyncio.Redis,
+            closer=self._close_pool,
+        )
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"kvdb-async-collector-{self.sentinel.sentinel_name}",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def _close_pool(self, pool):
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(pool.disconnect(), self._loop)
+
+    def submit(self, node):
+        """提交单个节点的采集任务，返回 concurrent.futures.Future。"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._collect(node['host'], node['port'], node['master_name'], node['node_role']),
+            loop,
+        )
+
+    def get_client(self, host, port, master_name):
+        return self.pool_registry.get_client(host, port, self.sentinel.get_redis_password(master_name))
+
+    async def _collect(self, host, port, master_name, node_role):
+        if self._semaphore is None:
+            # 信号量需在事件循环线程内创建
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        node_key = (str(host), int(port))
+        async with self._semaphore:
+            try:
+                info, command_stats, keyspace_info = await asyncio.wait_for(
+                    self._fetch(host, port, master_name, node_key),
+                    timeout=self.node_deadline,
+                )
+            except asyncio.TimeoutError:
+                self.sentinel._forget_node(node_key)
+                logging.warning("采集Redis %s:%s 超过 %s 秒, master_name=%s", host, port, self.node_deadline, master_name)
+                return self.sentinel._failed_node(host, port, master_name, node_role, "node deadline exceeded")
+            except (redis.RedisError, OSError) as exc:
+                self.sentinel._forget_node(node_key)
+                logging.warning("从Redis %s:%s 获取信息失败, master_name=%s - %s", host, port, master_name, exc)
+                return self.sentinel._failed_node(host, port, master_name, node_role, str(exc))
+
+        return self.sentinel._build_node_info(host, port, master_name, node_role, info, command_stats, keyspace_info)
+
+    async def _fetch(self, host, port, master_name, node_key):
+        """INFO 与到期的 commandstats（KVRocks 另加 keyspace）合并为一次流水线往返。"""
+        client = self.get_client(host, port, master_name)
+        capability = self.sentinel._node_capabilities.get(node_key)
+        known_kvrocks = capability is not None and capability['engine'] == ENGINE_KVROCKS
+        with_commandstats, with_keyspace = self.sentinel._due_sections(
+            node_key,
+            capability['engine'] if capability is not None else ENGINE_REDIS,
+        )
+
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.info()
+            if with_commandstats:
+                pipe.info('commandstats')
+            if with_keyspace:
+                pipe.execute_command('info', 'keyspace')
+            replies = await pipe.execute(raise_on_error=False)
+
+        info = replies[0]
+        if isinstance(info, Exception):
+            raise info
+        command_stats = {}
+        if with_commandstats and not isinstance(replies[1], Exception):
+            command_stats = replies[1]
+        keyspace_info = None
+        if with_keyspace and not isinstance(replies[-1], Exception):
+            keyspace_info = replies[-1]
+
+        node_type = self.sentinel.detect_engine(info)
+        if not known_kvrocks and self.sentinel._optional_sections(node_type)[1]:
+            try:
+                keyspace_info = await client.execute_command('info', 'keyspace')
+                with_keyspace = True
+            except redis.RedisError as exc:
+                logging.debug("获取KVRocks键总数失败: %s", exc)
+        if capability is None or capability['engine'] != node_type:
+            self.sentinel._section_cache.pop(node_key, None)
+            self.sentinel._node_capabilities[node_key] = {
+                'engine': node_type,
+                'info_mode': self.sentinel._preferred_info_mode(node_type),
+                'has_commandstats': bool(command_stats),
+            }
+        return (info,) + self.sentinel._merge_sections(
+            node_key, node_type, command_stats, keyspace_info, with_commandstats, with_keyspace
+        )
+
+    def close(self):
+        """关闭连接池并停止事件循环线程。"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._disconnect_all(), loop).result(timeout=2)
+        except Exception as exc:
+            logging.debug("关闭异步连接池失败: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=2)
+
+    async def _disconnect_all(self):
+        for pool in self.pool_registry.drain():
+            await pool.disconnect()
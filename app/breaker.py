@@ -0,0 +1,81 @@
+import threading
+import time
+
+
+BREAKER_CLOSED = 0
+BREAKER_HALF_OPEN = 1
+BREAKER_OPEN = 2
+
+
+class CircuitBreaker:
+    """按节点统计连续失败，熔断后按指数退避只放行一次半开探测。"""
+
+    def __init__(self, threshold=3, backoff=5, max_backoff=300):
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        # (host, port) -> {'state', 'failures', 'opens', 'retry_at'}
+        self._nodes = {}
+
+    @staticmethod
+    def _key(host, port):
+        return str(host), int(port)
+
+    def allow(self, host, port, now=None):
+        """是否允许本次采集该节点；熔断到期时转为半开并只放行一个探测。"""
+        if self.threshold <= 0:
+            return True
+        now = now if now is not None else time.time()
+        with self._lock:
+            node = self._nodes.get(self._key(host, port))
+            if node is None or node['state'] == BREAKER_CLOSED:
+                return True
+            if node['state'] == BREAKER_OPEN and now >= node['retry_at']:
+                node['state'] = BREAKER_HALF_OPEN
+                return True
+            return False
+
+    def record_success(self, host, port):
+        with self._lock:
+            self._nodes.pop(self._key(host, port), None)
+
+    def record_failure(self, host, port, now=None):
+        if self.threshold <= 0:
+            return
+        now = now if now is not None else time.time()
+        with self._lock:
+            node = self._nodes.setdefault(
+                self._key(host, port),
+                {'state': BREAKER_CLOSED, 'failures': 0, 'opens': 0, 'retry_at': 0},
+            )
+            node['failures'] += 1
+            if node['state'] == BREAKER_HALF_OPEN or node['failures'] >= self.threshold:
+                # 半开探测失败时退避时间翻倍
+                delay = min(self.max_backoff, self.backoff * (2 ** node['opens']))
+                node['opens'] += 1
+                node['state'] = BREAKER_OPEN
+                node['retry_at'] = now + delay
+
+    def retain(self, addresses):
+        """只保留 addresses 中节点的熔断状态。"""
+        alive = {self._key(host, port) for host, port in addresses}
+        with self._lock:
+            for key in [key for key in self._nodes if key not in alive]:
+                self._nodes.pop(key)
+
+    def stats(self, now=None):
+        """返回处于失败计数或熔断中的节点状态。"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            nodes = list(self._nodes.items())
+        return [
+            {
+                'host': key[0],
+                'port': key[1],
+                'state': node['state'],
+                'failures': node['failures'],
+                'retry_in': max(0.0, node['retry_at'] - now) if node['state'] == BREAKER_OPEN else 0.0,
+            }
+            for key, node in nodes
+        ]
@@ -2,6 +2,8 @@ import logging
 import os
 import yaml
 
+from .metrics import RedisMetricsCollector
+
 
 class ConfigError(ValueError):
     """Raised when the YAML configuration is invalid."""
@@ -10,6 +12,8 @@ class ConfigError(ValueError):
 class Config:
     _config = None
     _config_path = None
+    # 每次成功加载配置后递增，供缓存判断配置是否已重新加载
+    _generation = 0
     DEFAULT_BLOCKED_COMMANDS = [
         'acl',
         'bgrewriteaof',
@@ -30,6 +34,8 @@ class Config:
         'slaveof',
         'sync',
     ]
+    # 默认 INFO 之外可按需关闭的段落
+    OPTIONAL_INFO_SECTIONS = ('commandstats', 'keyspace')
 
     @staticmethod
     def _resolve_env(value):
@@ -60,6 +66,23 @@ class Config:
             raise ConfigError(f"{field_name} 必须大于等于 {minimum}")
         return result
     
+    @classmethod
+    def _as_name_list(cls, value, field_name, allowed=None):
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            raise ConfigError(f"{field_name} 必须是列表")
+        names = []
+        for item in value:
+            name = str(item).strip().lower()
+            if not name:
+                continue
+            if allowed is not None and name not in allowed:
+                raise ConfigError(f"{field_name} 不支持 '{name}'，可选值: {', '.join(allowed)}")
+            if name not in names:
+                names.append(name)
+        return names
+    
     @classmethod
     def load_config(cls, config_file='config.yaml', force_reload=False):
         """加载配置文件"""
@@ -77,6 +100,7 @@ class Config:
                         loaded_config = yaml.safe_load(f) or {}
                     cls._config = cls._validate_config(loaded_config)
                     cls._config_path = path
+                    cls._generation += 1
                     logging.info(f"成功从 {path} 加载配置")
                     break
             
@@ -85,6 +109,11 @@ class Config:
                 
         return cls._config
 
+    @classmethod
+    def generation(cls):
+        """配置加载代数，重新加载后变化。"""
+        return cls._generation
+
     @classmethod
     def reload_config(cls, config_file=None):
         """强制重新加载配置文件。"""
@@ -127,15 +156,60 @@ class Config:
         if not isinstance(metrics, dict):
             raise ConfigError("metrics 必须是对象")
         metrics['thread_pool_size'] = cls._as_int(metrics.get('thread_pool_size', 10), 'metrics.thread_pool_size', minimum=1)
+        metrics['executor_max_workers'] = cls._as_int(metrics.get('executor_max_workers', 64), 'metrics.executor_max_workers', minimum=1)
         metrics['connect_timeout'] = cls._as_float(metrics.get('connect_timeout', 3), 'metrics.connect_timeout', minimum=0.1)
         metrics['read_timeout'] = cls._as_float(metrics.get('read_timeout', 5), 'metrics.read_timeout', minimum=0.1)
         metrics['discovery_ttl'] = cls._as_int(metrics.get('discovery_ttl', 30), 'metrics.discovery_ttl', minimum=1)
+        metrics['topology_events'] = bool(metrics.get('topology_events', True))
+        metrics['topology_sweep_interval'] = cls._as_int(metrics.get('topology_sweep_interval', 300), 'metrics.topology_sweep_interval', minimum=1)
+        metrics['sentinel_probe_interval'] = cls._as_float(metrics.get('sentinel_probe_interval', 10), 'metrics.sentinel_probe_interval', minimum=0)
+        metrics['pool_idle_timeout'] = cls._as_float(metrics.get('pool_idle_timeout', 300), 'metrics.pool_idle_timeout', minimum=0)
+        collection_engine = str(metrics.get('collection_engine', 'thread')).strip().lower()
+        if collection_engine not in ('thread', 'asyncio'):
+            raise ConfigError("metrics.collection_engine 必须是 thread 或 asyncio")
+        metrics['collection_engine'] = collection_engine
+        metrics['async_concurrency'] = cls._as_int(metrics.get('async_concurrency', 200), 'metrics.async_concurrency', minimum=1)
+        metrics['node_deadline'] = cls._as_float(metrics.get('node_deadline', 0), 'metrics.node_deadline', minimum=0)
+        metrics['collect_interval'] = cls._as_float(metrics.get('collect_interval', 15), 'metrics.collect_interval', minimum=0)
+        metrics['series_timestamps'] = bool(metrics.get('series_timestamps', False))
+        # Docker 镜像通过 SHARED_SNAPSHOT_DIR 默认开启多 worker 共享快照，挂载的配置文件未配置时同样生效
+        shared_snapshot_dir = os.environ.get('SHARED_SNAPSHOT_DIR', cls._resolve_env(metrics.get('shared_snapshot_dir')))
+        metrics['shared_snapshot_dir'] = str(shared_snapshot_dir or '').strip()
+        # 分片配置可由环境变量覆盖，便于多副本部署时为每个实例单独指定
+        metrics['shard_count'] = cls._as_int(os.environ.get('SHARD_COUNT', metrics.get('shard_count', 1)), 'metrics.shard_count', minimum=1)
+        metrics['shard_index'] = cls._as_int(os.environ.get('SHARD_INDEX', metrics.get('shard_index', 0)), 'metrics.shard_index', minimum=0)
+        if metrics['shard_index'] >= metrics['shard_count']:
+            raise ConfigError("metrics.shard_index 必须小于 metrics.shard_count")
+        metric_families = RedisMetricsCollector.family_names()
+        for field in ('include_families', 'exclude_families'):
+            metrics[field] = cls._as_name_list(metrics.get(field), f'metrics.{field}', metric_families)
+        metrics['legacy_total_gauges'] = bool(metrics.get('legacy_total_gauges', True))
+        metrics['include_sections'] = cls._as_name_list(
+            metrics.get('include_sections', list(cls.OPTIONAL_INFO_SECTIONS)),
+            'metrics.include_sections',
+            cls.OPTIONAL_INFO_SECTIONS,
+        )
+        metrics['exclude_sections'] = cls._as_name_list(metrics.get('exclude_sections'), 'metrics.exclude_sections', cls.OPTIONAL_INFO_SECTIONS)
+        section_intervals = metrics.get('section_intervals') or {}
+        if not isinstance(section_intervals, dict):
+            raise ConfigError("metrics.section_intervals 必须是对象")
+        for section, interval in list(section_intervals.items()):
+            if section not in cls.OPTIONAL_INFO_SECTIONS:
+                raise ConfigError(f"metrics.section_intervals 不支持 '{section}'，可选值: {', '.join(cls.OPTIONAL_INFO_SECTIONS)}")
+            section_intervals[section] = cls._as_float(interval, f'metrics.section_intervals.{section}', minimum=0)
+        metrics['section_intervals'] = section_intervals
+        metrics['scrape_deadline'] = cls._as_float(metrics.get('scrape_deadline', 0), 'metrics.scrape_deadline', minimum=0)
+        metrics['scrape_timeout_offset'] = cls._as_float(metrics.get('scrape_timeout_offset', 0.5), 'metrics.scrape_timeout_offset', minimum=0)
+        metrics['breaker_threshold'] = cls._as_int(metrics.get('breaker_threshold', 3), 'metrics.breaker_threshold', minimum=0)
+        metrics['breaker_backoff'] = cls._as_float(metrics.get('breaker_backoff', 5), 'metrics.breaker_backoff', minimum=0.1)
+        metrics['breaker_max_backoff'] = cls._as_float(metrics.get('breaker_max_backoff', 300), 'metrics.breaker_max_backoff', minimum=0.1)
 
         web_ui = config.setdefault('web_ui', {})
         if not isinstance(web_ui, dict):
             raise ConfigError("web_ui 必须是对象")
         web_ui['refresh_interval'] = cls._as_int(web_ui.get('refresh_interval', 30), 'web_ui.refresh_interval', minimum=1)
         web_ui['analytics_enabled'] = bool(web_ui.get('analytics_enabled', False))
+        web_ui['max_streams'] = cls._as_int(web_ui.get('max_streams', 4), 'web_ui.max_streams', minimum=0)
 
         terminal = config.setdefault('terminal', {})
         if not isinstance(terminal, dict):
@@ -230,6 +304,23 @@ class Config:
         config = cls.get_config()
         return config.get('metrics', {})
     
+    @classmethod
+    def get_info_sections(cls):
+        """获取启用的可选 INFO 段落"""
+        metrics = cls.get_metrics_config()
+        include = metrics.get('include_sections', list(cls.OPTIONAL_INFO_SECTIONS))
+        return frozenset(include) - frozenset(metrics.get('exclude_sections', []))
+    
+    @classmethod
+    def get_metric_families(cls):
+        """获取启用的指标族名称"""
+        metrics = cls.get_metrics_config()
+        return RedisMetricsCollector.select_families(
+            metrics.get('include_families'),
+            metrics.get('exclude_families'),
+            metrics.get('legacy_total_gauges', True),
+        )
+    
     @classmethod
     def get_web_ui_config(cls):
         """获取Web UI配置"""
@@ -0,0 +1,91 @@
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .config import Config
+
+
+class SharedExecutor:
+    """进程级共享线程池：按哨兵组限制并发，整体受 max_workers 上限约束。"""
+
+    def __init__(self, max_workers=64):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kvdb-worker')
+        self._lock = threading.Lock()
+        self._limits = {}
+        self._running = defaultdict(int)
+        self._pending = defaultdict(deque)
+        self._active = 0
+
+    def submit(self, group, limit, fn, *args):
+        """提交任务；该组运行中的任务达到 limit 时在组内排队，不占用工作线程。"""
+        future = Future()
+        task = (future, fn, args)
+        with self._lock:
+            self._limits[group] = limit
+            if self._running[group] < limit:
+                self._running[group] += 1
+            else:
+                self._pending[group].append(task)
+                return future
+        self._dispatch(group, task)
+        return future
+
+    def _dispatch(self, group, task):
+        self._executor.submit(self._run, group, task)
+
+    def _run(self, group, task):
+        future, fn, args = task
+        with self._lock:
+            self._active += 1
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._active -= 1
+                next_task = self._pending[group].popleft() if self._pending[group] else None
+                if next_task is None:
+                    self._running[group] -= 1
+            if next_task is not None:
+                self._dispatch(group, next_task)
+
+    def stats(self):
+        """返回线程池整体与各组的运行、排队情况。"""
+        with self._lock:
+            groups = {
+                group: {
+                    'limit': limit,
+                    'running': self._running[group],
+                    'queued': len(self._pending[group]),
+                }
+                for group, limit in self._limits.items()
+            }
+            active = self._active
+        return {
+            'max_workers': self.max_workers,
+            'active_workers': active,
+            'queued_tasks': self._executor._work_queue.qsize(),
+            'groups': groups,
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor():
+    """获取（必要时按配置创建）进程级共享线程池。"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                max_workers = Config.get_metrics_config().get('executor_max_workers', 64)
+                _shared_executor = SharedExecutor(max_workers)
+    return _shared_executor
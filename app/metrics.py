@@ -1,74 +1,191 @@
-from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.openmetrics import exposition as openmetrics
 
+FORMAT_TEXT = 'text'
+FORMAT_OPENMETRICS = 'openmetrics'
+# 可协商的输出格式：媒体类型 -> 格式，按服务端偏好排列
+FORMAT_MEDIA_TYPES = (
+    ('text/plain', FORMAT_TEXT),
+    ('application/openmetrics-text', FORMAT_OPENMETRICS),
+)
+OPENMETRICS_EOF = b'# EOF\n'
 
-class RedisMetricsCollector:
-    """Redis指标收集器"""
 
-    BASE_LABELS = ['db_instance', 'db_instance_ip', 'group_name', 'role', 'sentinel_name']
+class _FamilySource:
+    """供 generate_latest 调用的最小 Collector 包装。"""
 
-    def __init__(self):
-        self.registry = CollectorRegistry()
+    def __init__(self, families):
+        self.families = families
 
-        self.scrape_success = Gauge(
-            'kvdb_scrape_success',
-            '本次采集是否完全成功',
-            ['sentinel_name'],
-            registry=self.registry,
-        )
-        self.scrape_duration_seconds = Gauge(
-            'kvdb_scrape_duration_seconds',
-            '本次采集耗时',
-            ['sentinel_name'],
-            registry=self.registry,
-        )
-        self.sentinel_up = Gauge(
-            'kvdb_sentinel_up',
-            'Sentinel实例是否在线',
-            ['sentinel_name', 'sentinel_host', 'sentinel_port'],
-            registry=self.registry,
-        )
+    def collect(self):
+        return self.families
+
+
+class _DiscardedSamples(list):
+    """未启用指标族的样本容器，丢弃所有写入。"""
+
+    def append(self, item):
+        pass
+
+
+class RedisMetricsCollector:
+    """Redis指标收集器，直接由采集快照生成指标族，不经过 Gauge 子对象。"""
 
-        self.up = Gauge('kvdb_up', 'Redis实例是否在线', self.BASE_LABELS, registry=self.registry)
-        self.node_role = Gauge('kvdb_role', 'Redis节点角色(1=主库, 0=从库)', self.BASE_LABELS, registry=self.registry)
-        self.uptime_in_seconds = Gauge('kvdb_uptime_in_seconds', 'Redis实例运行时间（秒）', self.BASE_LABELS, registry=self.registry)
-        self.connected_clients = Gauge('kvdb_connected_clients', 'Redis连接的客户端数量', self.BASE_LABELS, registry=self.registry)
-        self.max_clients = Gauge('kvdb_max_clients', 'Redis最大客户端连接数', self.BASE_LABELS, registry=self.registry)
-        self.blocked_clients = Gauge('kvdb_blocked_clients', 'Redis阻塞的客户端数量', self.BASE_LABELS, registry=self.registry)
-        self.memory_used_bytes = Gauge('kvdb_memory_used_bytes', 'Redis已使用内存字节数', self.BASE_LABELS, registry=self.registry)
-        self.memory_rss_bytes = Gauge('kvdb_memory_rss_bytes', 'Redis RSS内存字节数', self.BASE_LABELS, registry=self.registry)
-        self.memory_max_bytes = Gauge('kvdb_memory_max_bytes', 'Redis最大可用内存字节数', self.BASE_LABELS, registry=self.registry)
-
-        self.commands_processed = Gauge('kvdb_commands_processed', 'Redis处理的命令累计数', self.BASE_LABELS, registry=self.registry)
-        self.commands_processed_total = Gauge('kvdb_commands_processed_total', '兼容旧面板的Redis处理命令累计数', self.BASE_LABELS, registry=self.registry)
-        self.net_input_bytes = Gauge('kvdb_net_input_bytes', 'Redis接收的累计字节数', self.BASE_LABELS, registry=self.registry)
-        self.net_input_bytes_total = Gauge('kvdb_net_input_bytes_total', '兼容旧面板的Redis接收累计字节数', self.BASE_LABELS, registry=self.registry)
-        self.net_output_bytes = Gauge('kvdb_net_output_bytes', 'Redis发送的累计字节数', self.BASE_LABELS, registry=self.registry)
-        self.net_output_bytes_total = Gauge('kvdb_net_output_bytes_total', '兼容旧面板的Redis发送累计字节数', self.BASE_LABELS, registry=self.registry)
-
-        self.net_input_kbps = Gauge('kvdb_net_input_kbps', '进入Redis的网络流量(KB/s)', self.BASE_LABELS, registry=self.registry)
-        self.net_output_kbps = Gauge('kvdb_net_output_kbps', '从Redis流出的网络流量(KB/s)', self.BASE_LABELS, registry=self.registry)
-        self.db_keys = Gauge('kvdb_db_keys', 'Redis数据库中的键数量', self.BASE_LABELS + ['db'], registry=self.registry)
-        self.db_keys_expiring = Gauge('kvdb_db_keys_expiring', 'Redis数据库中设置了过期时间的键数量', self.BASE_LABELS + ['db'], registry=self.registry)
-
-        self.evicted_keys = Gauge('kvdb_evicted_keys', 'Redis因内存限制被驱逐的键累计数', self.BASE_LABELS, registry=self.registry)
-        self.evicted_keys_total = Gauge('kvdb_evicted_keys_total', '兼容旧面板的驱逐键累计数', self.BASE_LABELS, registry=self.registry)
-        self.commands = Gauge('kvdb_commands', 'Redis各命令的累计执行次数', self.BASE_LABELS + ['command'], registry=self.registry)
-        self.commands_total = Gauge('kvdb_commands_total', '兼容旧面板的Redis各命令累计执行次数', self.BASE_LABELS + ['command'], registry=self.registry)
-
-        self.slowlog_length = Gauge('kvdb_slowlog_length', 'Redis慢日志的长度', self.BASE_LABELS, registry=self.registry)
-        self.connected_slaves = Gauge('kvdb_connected_slaves', 'Redis连接的从节点数量', self.BASE_LABELS, registry=self.registry)
-        self.master_last_io_seconds_ago = Gauge('kvdb_master_last_io_seconds_ago', '主节点最后一次与从节点通信的时间（秒）', self.BASE_LABELS, registry=self.registry)
-        self.master_repl_offset = Gauge('kvdb_master_repl_offset', '主节点复制偏移量', self.BASE_LABELS, registry=self.registry)
-        self.master_link_status = Gauge('kvdb_master_link_status', 'master主从状态', self.BASE_LABELS, registry=self.registry)
-        self.instantaneous_ops_per_sec = Gauge('kvdb_instantaneous_ops_per_sec', '当前每秒执行的命令数', self.BASE_LABELS, registry=self.registry)
-        self.version = Gauge('kvdb_version', '兼容旧面板的版本号数字表示', self.BASE_LABELS, registry=self.registry)
-        self.build_info = Gauge('kvdb_build_info', 'Redis/KVRocks版本信息', self.BASE_LABELS + ['engine', 'version'], registry=self.registry)
-        self.port = Gauge('kvdb_port', 'Redis监听端口', self.BASE_LABELS, registry=self.registry)
-        self.engine_type = Gauge('kvdb_engine_type', '引擎类型(1=Redis, 2=KVRocks, 3=Pika)', self.BASE_LABELS, registry=self.registry)
-
-        self.db_used_bytes = Gauge('kvdb_db_used_bytes', '硬盘存储类型的引擎存储数据所占硬盘字节数', self.BASE_LABELS, registry=self.registry)
-        self.disk_used_bytes = Gauge('kvdb_disk_used_bytes', '当前硬盘总使用字节数', self.BASE_LABELS, registry=self.registry)
-        self.disk_max_bytes = Gauge('kvdb_disk_max_bytes', '当前硬盘总字节数', self.BASE_LABELS, registry=self.registry)
+    BASE_LABELS = ['db_instance', 'db_instance_ip', 'group_name', 'role', 'sentinel_name']
+    # 渲染时实时计算的指标，不附加快照时间戳
+    LIVE_FAMILIES = (
+        'kvdb_snapshot_age_seconds',
+        'kvdb_coalesced_requests_total',
+        'kvdb_connection_pool_in_use',
+        'kvdb_connection_pool_idle',
+        'kvdb_node_breaker_state',
+        'kvdb_node_breaker_failures',
+        'kvdb_node_breaker_retry_seconds',
+        'kvdb_executor_max_workers',
+        'kvdb_executor_active_workers',
+        'kvdb_executor_saturation',
+        'kvdb_executor_queued_tasks',
+        'kvdb_executor_group_running',
+        'kvdb_executor_queue_depth',
+    )
+
+    # 与新指标重复、仅为兼容旧面板保留的指标，可通过配置关闭
+    LEGACY_FAMILIES = (
+        'kvdb_commands_processed_total',
+        'kvdb_net_input_bytes_total',
+        'kvdb_net_output_bytes_total',
+        'kvdb_evicted_keys_total',
+        'kvdb_commands_total',
+    )
+
+    # (指标名, 帮助信息, 标签)，输出顺序与此一致
+    FAMILIES = (
+        ('kvdb_scrape_success', '本次采集是否完全成功', ('sentinel_name',)),
+        ('kvdb_scrape_duration_seconds', '本次采集耗时', ('sentinel_name',)),
+        ('kvdb_snapshot_age_seconds', '当前返回的采集快照距今的秒数', ('sentinel_name',)),
+        ('kvdb_coalesced_requests_total', '并发请求合并到同一次采集的累计次数', ('sentinel_name',)),
+        ('kvdb_sentinel_up', 'Sentinel实例是否在线', ('sentinel_name', 'sentinel_host', 'sentinel_port')),
+        ('kvdb_sentinel_latency_seconds', 'Sentinel请求延迟的滑动平均值（秒）', ('sentinel_name', 'sentinel_host', 'sentinel_port')),
+        ('kvdb_shard_owned_nodes', '本实例所在分片负责采集的节点数', ('sentinel_name', 'shard_index', 'shard_count')),
+        ('kvdb_connection_pool_in_use', '节点连接池中正在使用的连接数', ('sentinel_name', 'db_instance')),
+        ('kvdb_connection_pool_idle', '节点连接池中空闲的连接数', ('sentinel_name', 'db_instance')),
+        ('kvdb_node_breaker_state', '节点熔断状态(0=关闭, 1=半开, 2=熔断)', ('sentinel_name', 'db_instance')),
+        ('kvdb_node_breaker_failures', '节点连续采集失败次数', ('sentinel_name', 'db_instance')),
+        ('kvdb_node_breaker_retry_seconds', '熔断节点距下一次半开探测的秒数', ('sentinel_name', 'db_instance')),
+        ('kvdb_executor_max_workers', '共享采集线程池的线程数上限', ()),
+        ('kvdb_executor_active_workers', '共享采集线程池中正在执行任务的线程数', ()),
+        ('kvdb_executor_saturation', '共享采集线程池饱和度（活跃线程/线程上限）', ()),
+        ('kvdb_executor_queued_tasks', '等待空闲线程的任务数', ()),
+        ('kvdb_executor_group_running', '哨兵组正在执行的采集任务数', ('sentinel_name',)),
+        ('kvdb_executor_queue_depth', '哨兵组因并发限制排队的采集任务数', ('sentinel_name',)),
+
+        ('kvdb_up', 'Redis实例是否在线', BASE_LABELS),
+        ('kvdb_node_scrape_timed_out', '节点未在采集截止时间内完成，结果留给下次采集', BASE_LABELS),
+        ('kvdb_role', 'Redis节点角色(1=主库, 0=从库)', BASE_LABELS),
+        ('kvdb_uptime_in_seconds', 'Redis实例运行时间（秒）', BASE_LABELS),
+        ('kvdb_connected_clients', 'Redis连接的客户端数量', BASE_LABELS),
+        ('kvdb_max_clients', 'Redis最大客户端连接数', BASE_LABELS),
+        ('kvdb_blocked_clients', 'Redis阻塞的客户端数量', BASE_LABELS),
+        ('kvdb_memory_used_bytes', 'Redis已使用内存字节数', BASE_LABELS),
+        ('kvdb_memory_rss_bytes', 'Redis RSS内存字节数', BASE_LABELS),
+        ('kvdb_memory_max_bytes', 'Redis最大可用内存字节数', BASE_LABELS),
+
+        ('kvdb_commands_processed', 'Redis处理的命令累计数', BASE_LABELS),
+        ('kvdb_commands_processed_total', '兼容旧面板的Redis处理命令累计数', BASE_LABELS),
+        ('kvdb_net_input_bytes', 'Redis接收的累计字节数', BASE_LABELS),
+        ('kvdb_net_input_bytes_total', '兼容旧面板的Redis接收累计字节数', BASE_LABELS),
+        ('kvdb_net_output_bytes', 'Redis发送的累计字节数', BASE_LABELS),
+        ('kvdb_net_output_bytes_total', '兼容旧面板的Redis发送累计字节数', BASE_LABELS),
+
+        ('kvdb_net_input_kbps', '进入Redis的网络流量(KB/s)', BASE_LABELS),
+        ('kvdb_net_output_kbps', '从Redis流出的网络流量(KB/s)', BASE_LABELS),
+        ('kvdb_db_keys', 'Redis数据库中的键数量', BASE_LABELS + ['db']),
+        ('kvdb_db_keys_expiring', 'Redis数据库中设置了过期时间的键数量', BASE_LABELS + ['db']),
+
+        ('kvdb_evicted_keys', 'Redis因内存限制被驱逐的键累计数', BASE_LABELS),
+        ('kvdb_evicted_keys_total', '兼容旧面板的驱逐键累计数', BASE_LABELS),
+        ('kvdb_commands', 'Redis各命令的累计执行次数', BASE_LABELS + ['command']),
+        ('kvdb_commands_total', '兼容旧面板的Redis各命令累计执行次数', BASE_LABELS + ['command']),
+
+        ('kvdb_slowlog_length', 'Redis慢日志的长度', BASE_LABELS),
+        ('kvdb_connected_slaves', 'Redis连接的从节点数量', BASE_LABELS),
+        ('kvdb_master_last_io_seconds_ago', '主节点最后一次与从节点通信的时间（秒）', BASE_LABELS),
+        ('kvdb_master_repl_offset', '主节点复制偏移量', BASE_LABELS),
+        ('kvdb_master_link_status', 'master主从状态', BASE_LABELS),
+        ('kvdb_instantaneous_ops_per_sec', '当前每秒执行的命令数', BASE_LABELS),
+        ('kvdb_version', '兼容旧面板的版本号数字表示', BASE_LABELS),
+        ('kvdb_build_info', 'Redis/KVRocks版本信息', BASE_LABELS + ['engine', 'version']),
+        ('kvdb_port', 'Redis监听端口', BASE_LABELS),
+        ('kvdb_engine_type', '引擎类型(1=Redis, 2=KVRocks, 3=Pika)', BASE_LABELS),
+
+        ('kvdb_db_used_bytes', '硬盘存储类型的引擎存储数据所占硬盘字节数', BASE_LABELS),
+        ('kvdb_disk_used_bytes', '当前硬盘总使用字节数', BASE_LABELS),
+        ('kvdb_disk_max_bytes', '当前硬盘总字节数', BASE_LABELS),
+    )
+
+    # 直接取自INFO字段的节点指标：(INFO字段, 指标名列表)
+    INFO_FIELDS = (
+        ('connected_clients', ('kvdb_connected_clients',)),
+        ('maxclients', ('kvdb_max_clients',)),
+        ('blocked_clients', ('kvdb_blocked_clients',)),
+        ('used_memory', ('kvdb_memory_used_bytes',)),
+        ('used_memory_rss', ('kvdb_memory_rss_bytes',)),
+        ('total_commands_processed', ('kvdb_commands_processed', 'kvdb_commands_processed_total')),
+        ('total_net_input_bytes', ('kvdb_net_input_bytes', 'kvdb_net_input_bytes_total')),
+        ('total_net_output_bytes', ('kvdb_net_output_bytes', 'kvdb_net_output_bytes_total')),
+        ('instantaneous_input_kbps', ('kvdb_net_input_kbps',)),
+        ('instantaneous_output_kbps', ('kvdb_net_output_kbps',)),
+        ('evicted_keys', ('kvdb_evicted_keys', 'kvdb_evicted_keys_total')),
+        ('slowlog_len', ('kvdb_slowlog_length',)),
+        ('connected_slaves', ('kvdb_connected_slaves',)),
+        ('master_last_io_seconds_ago', ('kvdb_master_last_io_seconds_ago',)),
+        ('master_repl_offset', ('kvdb_master_repl_offset',)),
+        ('instantaneous_ops_per_sec', ('kvdb_instantaneous_ops_per_sec',)),
+        ('tcp_port', ('kvdb_port',)),
+    )
+    KVROCKS_FIELDS = (
+        ('used_db_size', ('kvdb_db_used_bytes',)),
+        ('used_disk_size', ('kvdb_disk_used_bytes',)),
+        ('disk_capacity', ('kvdb_disk_max_bytes',)),
+    )
+
+    def __init__(self, families=None):
+        # families 为启用的指标族名称集合，None 表示全部启用
+        self._families = frozenset(families) if families is not None else frozenset(self.family_names())
+        # 指标名 -> [(标签值元组, 数值)]，未启用的指标族直接丢弃样本
+        discarded = _DiscardedSamples()
+        self._samples = {
+            name: [] if name in self._families else discarded
+            for name, _, _ in self.FAMILIES
+        }
+        self._info_fields = self._enabled_fields(self.INFO_FIELDS)
+        self._kvrocks_fields = self._enabled_fields(self.KVROCKS_FIELDS)
+
+    @classmethod
+    def family_names(cls):
+        return [name for name, _, _ in cls.FAMILIES]
+
+    @classmethod
+    def select_families(cls, include=None, exclude=None, legacy_total_gauges=True):
+        """按包含/排除列表计算启用的指标族，include 为空表示全部。"""
+        families = set(include) if include else set(cls.family_names())
+        families.difference_update(exclude or ())
+        if not legacy_total_gauges:
+            families.difference_update(cls.LEGACY_FAMILIES)
+        return frozenset(families)
+
+    def _enabled_fields(self, fields):
+        """过滤掉全部指标都未启用的 INFO 字段，避免无用的解析。"""
+        enabled = []
+        for field, names in fields:
+            names = tuple(name for name in names if name in self._families)
+            if names:
+                enabled.append((field, names))
+        return tuple(enabled)
+
+    def _add(self, name, label_values, value):
+        self._samples[name].append((label_values, float(value)))
 
     @staticmethod
     def _instance_ip(instance):
@@ -86,127 +203,154 @@ class RedisMetricsCollector:
         return int(digits) if digits else 0
 
     def _labels(self, instance, info, sentinel_name):
-        master_name = info.get('master_name', 'unknown')
-        role = info.get('node_role', 'unknown')
-        return {
-            'db_instance': instance,
-            'db_instance_ip': self._instance_ip(instance),
-            'group_name': master_name,
-            'role': role,
-            'sentinel_name': sentinel_name,
-        }
+        """按 BASE_LABELS 顺序返回节点标签值。"""
+        return (
+            instance,
+            self._instance_ip(instance),
+            info.get('master_name', 'unknown'),
+            info.get('node_role', 'unknown'),
+            sentinel_name,
+        )
 
     def collect_scrape_metrics(self, sentinel_name, success, duration, sentinel_status=None):
-        self.scrape_success.labels(sentinel_name=sentinel_name).set(1 if success else 0)
-        self.scrape_duration_seconds.labels(sentinel_name=sentinel_name).set(duration)
+        self._add('kvdb_scrape_success', (sentinel_name,), 1 if success else 0)
+        self._add('kvdb_scrape_duration_seconds', (sentinel_name,), duration)
 
         for status in sentinel_status or []:
-            self.sentinel_up.labels(
-                sentinel_name=sentinel_name,
-                sentinel_host=status.get('host', 'unknown'),
-                sentinel_port=str(status.get('port', 'unknown')),
-            ).set(status.get('up', 0))
+            labels = (sentinel_name, status.get('host', 'unknown'), str(status.get('port', 'unknown')))
+            self._add('kvdb_sentinel_up', labels, status.get('up', 0))
+            if status.get('latency') is not None:
+                self._add('kvdb_sentinel_latency_seconds', labels, status['latency'])
+
+    def collect_shard_metrics(self, sentinel_name, shard_index, shard_count, owned_nodes):
+        self._add('kvdb_shard_owned_nodes', (sentinel_name, str(shard_index), str(shard_count)), owned_nodes)
+
+    def collect_snapshot_metrics(self, sentinel_name, age, coalesced_requests=None):
+        self._add('kvdb_snapshot_age_seconds', (sentinel_name,), age)
+        # 统计来源不可用时不输出累计值，避免计数回退
+        if coalesced_requests is not None:
+            self._add('kvdb_coalesced_requests_total', (sentinel_name,), coalesced_requests)
+
+    def collect_pool_metrics(self, sentinel_name, pool_stats):
+        for stats in pool_stats or []:
+            instance = f"{stats['host']}:{stats['port']}"
+            self._add('kvdb_connection_pool_in_use', (sentinel_name, instance), stats.get('in_use', 0))
+            self._add('kvdb_connection_pool_idle', (sentinel_name, instance), stats.get('idle', 0))
+
+    def collect_breaker_metrics(self, sentinel_name, breaker_stats):
+        for stats in breaker_stats or []:
+            labels = (sentinel_name, f"{stats['host']}:{stats['port']}")
+            self._add('kvdb_node_breaker_state', labels, stats.get('state', 0))
+            self._add('kvdb_node_breaker_failures', labels, stats.get('failures', 0))
+            self._add('kvdb_node_breaker_retry_seconds', labels, stats.get('retry_in', 0))
+
+    def collect_executor_metrics(self, executor_stats, sentinel_name=None):
+        max_workers = executor_stats.get('max_workers', 0)
+        active_workers = executor_stats.get('active_workers', 0)
+        self._add('kvdb_executor_max_workers', (), max_workers)
+        self._add('kvdb_executor_active_workers', (), active_workers)
+        self._add('kvdb_executor_saturation', (), active_workers / max_workers if max_workers else 0)
+        self._add('kvdb_executor_queued_tasks', (), executor_stats.get('queued_tasks', 0))
+
+        for group, stats in executor_stats.get('groups', {}).items():
+            if sentinel_name is not None and group != sentinel_name:
+                continue
+            self._add('kvdb_executor_group_running', (group,), stats.get('running', 0))
+            self._add('kvdb_executor_queue_depth', (group,), stats.get('queued', 0))
 
     def collect_metrics(self, redis_info_dict, sentinel_name):
         """从Redis信息收集指标"""
+        samples = self._samples
+        families = self._families
+        with_keyspace = 'kvdb_db_keys' in families or 'kvdb_db_keys_expiring' in families
+        with_commands = 'kvdb_commands' in families or 'kvdb_commands_total' in families
         for instance, info in redis_info_dict.items():
             labels = self._labels(instance, info, sentinel_name)
             node_type = info.get('type', 1)
             is_kvrocks = node_type == 2
 
-            self.up.labels(**labels).set(info.get('up', 1))
+            if info.get('timed_out'):
+                # 慢节点本次没有数据，只输出超时标记，不输出 kvdb_up
+                samples['kvdb_node_scrape_timed_out'].append((labels, 1.0))
+                continue
+            samples['kvdb_up'].append((labels, float(info.get('up', 1))))
             if info.get('up') == 0:
                 continue
 
-            is_master = 1 if labels['role'] == 'master' else 0
-            self.node_role.labels(**labels).set(is_master)
-            self.engine_type.labels(**labels).set(node_type)
-            self.uptime_in_seconds.labels(**labels).set(info.get('uptime_in_seconds', 0))
-
-            if 'connected_clients' in info:
-                self.connected_clients.labels(**labels).set(info['connected_clients'])
-            if 'maxclients' in info:
-                self.max_clients.labels(**labels).set(info['maxclients'])
-            if 'blocked_clients' in info:
-                self.blocked_clients.labels(**labels).set(info['blocked_clients'])
-            if 'used_memory' in info:
-                self.memory_used_bytes.labels(**labels).set(info['used_memory'])
-            if 'used_memory_rss' in info:
-                self.memory_rss_bytes.labels(**labels).set(info['used_memory_rss'])
-
-            max_memory = 0 if is_kvrocks else info.get('maxmemory', 0)
-            self.memory_max_bytes.labels(**labels).set(max_memory)
-
-            if 'total_commands_processed' in info:
-                value = info['total_commands_processed']
-                self.commands_processed.labels(**labels).set(value)
-                self.commands_processed_total.labels(**labels).set(value)
-
-            if 'total_net_input_bytes' in info:
-                value = info['total_net_input_bytes']
-                self.net_input_bytes.labels(**labels).set(value)
-                self.net_input_bytes_total.labels(**labels).set(value)
-
-            if 'total_net_output_bytes' in info:
-                value = info['total_net_output_bytes']
-                self.net_output_bytes.labels(**labels).set(value)
-                self.net_output_bytes_total.labels(**labels).set(value)
-
-            if 'instantaneous_input_kbps' in info:
-                self.net_input_kbps.labels(**labels).set(info['instantaneous_input_kbps'])
-            if 'instantaneous_output_kbps' in info:
-                self.net_output_kbps.labels(**labels).set(info['instantaneous_output_kbps'])
-
-            for key, value in info.items():
-                if key.startswith('db') and isinstance(value, dict):
-                    if 'keys' in value:
-                        self.db_keys.labels(**labels, db=key).set(value['keys'])
-                    if 'expires' in value:
-                        self.db_keys_expiring.labels(**labels, db=key).set(value['expires'])
-
-            if 'evicted_keys' in info:
-                value = info['evicted_keys']
-                self.evicted_keys.labels(**labels).set(value)
-                self.evicted_keys_total.labels(**labels).set(value)
-
-            for cmd, stats in info.get('commandstats', {}).items():
-                cmd_name = cmd.replace('cmdstat_', '')
-                if 'calls' in stats:
-                    self.commands.labels(**labels, command=cmd_name).set(stats['calls'])
-                    self.commands_total.labels(**labels, command=cmd_name).set(stats['calls'])
-
-            if 'slowlog_len' in info:
-                self.slowlog_length.labels(**labels).set(info['slowlog_len'])
-            if 'connected_slaves' in info:
-                self.connected_slaves.labels(**labels).set(info['connected_slaves'])
-            if 'master_last_io_seconds_ago' in info:
-                self.master_last_io_seconds_ago.labels(**labels).set(info['master_last_io_seconds_ago'])
-            if 'master_repl_offset' in info:
-                self.master_repl_offset.labels(**labels).set(info['master_repl_offset'])
+            samples['kvdb_role'].append((labels, 1.0 if labels[3] == 'master' else 0.0))
+            samples['kvdb_engine_type'].append((labels, float(node_type)))
+            samples['kvdb_uptime_in_seconds'].append((labels, float(info.get('uptime_in_seconds', 0))))
+            samples['kvdb_memory_max_bytes'].append((labels, float(0 if is_kvrocks else info.get('maxmemory', 0))))
+
+            for field, names in self._info_fields:
+                if field in info:
+                    value = float(info[field])
+                    for name in names:
+                        samples[name].append((labels, value))
+
             if 'master_link_status' in info:
-                self.master_link_status.labels(**labels).set(1 if info['master_link_status'] == 'up' else 0)
-            if 'instantaneous_ops_per_sec' in info:
-                self.instantaneous_ops_per_sec.labels(**labels).set(info['instantaneous_ops_per_sec'])
+                samples['kvdb_master_link_status'].append((labels, 1.0 if info['master_link_status'] == 'up' else 0.0))
+
+            if with_keyspace:
+                for key, value in info.items():
+                    if key.startswith('db') and isinstance(value, dict):
+                        if 'keys' in value:
+                            samples['kvdb_db_keys'].append((labels + (key,), float(value['keys'])))
+                        if 'expires' in value:
+                            samples['kvdb_db_keys_expiring'].append((labels + (key,), float(value['expires'])))
+
+            if with_commands:
+                commands = samples['kvdb_commands']
+                commands_total = samples['kvdb_commands_total']
+                for cmd, stats in info.get('commandstats', {}).items():
+                    if 'calls' in stats:
+                        sample = (labels + (cmd.replace('cmdstat_', ''),), float(stats['calls']))
+                        commands.append(sample)
+                        commands_total.append(sample)
 
             if is_kvrocks:
-                if 'used_db_size' in info:
-                    self.db_used_bytes.labels(**labels).set(info['used_db_size'])
-                if 'used_disk_size' in info:
-                    self.disk_used_bytes.labels(**labels).set(info['used_disk_size'])
-                if 'disk_capacity' in info:
-                    self.disk_max_bytes.labels(**labels).set(info['disk_capacity'])
+                for field, names in self._kvrocks_fields:
+                    if field in info:
+                        value = float(info[field])
+                        for name in names:
+                            samples[name].append((labels, value))
 
             version_str = info.get('version') if is_kvrocks else info.get('redis_version', 'unknown')
-            self.version.labels(**labels).set(self._version_number(version_str))
-            self.build_info.labels(**labels, engine=self._engine_name(node_type), version=str(version_str)).set(1)
-
-            if 'tcp_port' in info:
-                self.port.labels(**labels).set(info['tcp_port'])
+            samples['kvdb_version'].append((labels, float(self._version_number(version_str))))
+            samples['kvdb_build_info'].append((labels + (self._engine_name(node_type), str(version_str)), 1.0))
 
-    def get_metrics(self):
-        """获取指标数据"""
-        return generate_latest(self.registry)
+    def collect(self, timestamp=None, live=None):
+        """生成指标族；timestamp 为快照采集时间（秒）时为非实时指标附加时间戳。
 
-    def get_content_type(self):
+        live 为 True 时只生成实时指标，为 False 时只生成快照指标，None 时全部生成。
+        """
+        live_families = self.LIVE_FAMILIES
+        for name, documentation, labelnames in self.FAMILIES:
+            if name not in self._families:
+                continue
+            if live is not None and (name in live_families) != live:
+                continue
+            family = GaugeMetricFamily(name, documentation, labels=labelnames)
+            sample_timestamp = None if name in live_families else timestamp
+            for label_values, value in self._samples[name]:
+                family.add_metric(label_values, value, timestamp=sample_timestamp)
+            yield family
+
+    def get_metrics(self, timestamp=None, live=None, fmt=FORMAT_TEXT):
+        """获取指标数据，timestamp 为快照采集时间（秒）时为样本附加时间戳。
+
+        OpenMetrics 格式下只渲染快照指标（live=False）时不输出 # EOF，由实时部分收尾。
+        """
+        source = _FamilySource(self.collect(timestamp, live))
+        if fmt != FORMAT_OPENMETRICS:
+            return generate_latest(source)
+        body = openmetrics.generate_latest(source)
+        if live is False and body.endswith(OPENMETRICS_EOF):
+            body = body[:-len(OPENMETRICS_EOF)]
+        return body
+
+    def get_content_type(self, fmt=FORMAT_TEXT):
         """获取内容类型"""
+        if fmt == FORMAT_OPENMETRICS:
+            return openmetrics.CONTENT_TYPE_LATEST
         return CONTENT_TYPE_LATEST
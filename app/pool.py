@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+
+import redis
+
+
+class ConnectionPoolRegistry:
+    """按 (host, port, password) 复用Redis连接池，跨多次采集保持长连接。"""
+
+    def __init__(self, connect_timeout=3, read_timeout=5, idle_timeout=300,
+                 pool_class=redis.ConnectionPool, client_class=redis.Redis, closer=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.idle_timeout = idle_timeout
+        self.pool_class = pool_class
+        self.client_class = client_class
+        # asyncio 连接池需要在所属事件循环中断开，由调用方提供关闭方式
+        self.closer = closer or (lambda pool: pool.disconnect())
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._last_used = {}
+
+    @staticmethod
+    def _key(host, port, password):
+        return str(host), int(port), password or ''
+
+    def get_pool(self, host, port, password=''):
+        """获取（必要时创建）节点对应的连接池。"""
+        key = self._key(host, port, password)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self.pool_class(
+                    host=key[0],
+                    port=key[1],
+                    password=password,
+                    socket_timeout=self.read_timeout,
+                    socket_connect_timeout=self.connect_timeout,
+                    decode_responses=True,
+                )
+                self._pools[key] = pool
+            self._last_used[key] = time.time()
+        return pool
+
+    def get_client(self, host, port, password=''):
+        """返回使用共享连接池的Redis客户端，调用方无需关闭。"""
+        return self.client_class(connection_pool=self.get_pool(host, port, password))
+
+    def _evict(self, keys):
+        evicted = []
+        with self._lock:
+            for key in keys:
+                pool = self._pools.pop(key, None)
+                self._last_used.pop(key, None)
+                if pool is not None:
+                    evicted.append((key, pool))
+
+        for key, pool in evicted:
+            try:
+                self.closer(pool)
+            except Exception as exc:
+                logging.debug("关闭连接池 %s:%s 失败: %s", key[0], key[1], exc)
+        return len(evicted)
+
+    def retain(self, addresses):
+        """只保留 addresses 中 (host, port) 对应的连接池，其余全部回收。"""
+        alive = {(str(host), int(port)) for host, port in addresses}
+        with self._lock:
+            stale = [key for key in self._pools if (key[0], key[1]) not in alive]
+        evicted = self._evict(stale)
+        if evicted:
+            logging.info("回收%d个已不在Sentinel发现结果中的连接池", evicted)
+        return evicted
+
+    def reap_idle(self, now=None):
+        """回收超过 idle_timeout 未被使用的连接池。"""
+        if self.idle_timeout <= 0:
+            return 0
+        now = now if now is not None else time.time()
+        with self._lock:
+            idle = [key for key, used_at in self._last_used.items() if now - used_at > self.idle_timeout]
+        return self._evict(idle)
+
+    def stats(self):
+        """返回每个连接池的使用中/空闲连接数。"""
+        with self._lock:
+            pools = list(self._pools.items())
+        return [
+            {
+                'host': key[0],
+                'port': key[1],
+                'in_use': len(pool._in_use_connections),
+                'idle': len(pool._available_connections),
+            }
+            for key, pool in pools
+        ]
+
+    def drain(self):
+        """移出全部连接池并返回，由调用方负责断开。"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._last_used.clear()
+        return pools
+
+    def close(self):
+        """关闭全部连接池。"""
+        with self._lock:
+            keys = list(self._pools)
+        self._evict(keys)
@@ -0,0 +1,100 @@
+import logging
+import threading
+
+from .config import Config
+
+
+class SentinelRegistry:
+    """按哨兵组懒加载并缓存客户端；配置重新加载后只重建配置发生变化的组。"""
+
+    def __init__(self, factory, on_discard=None):
+        self.factory = factory
+        self.on_discard = on_discard
+        self._lock = threading.Lock()
+        self._group_locks = {}
+        # sentinel_name -> (配置指纹, 客户端)
+        self._entries = {}
+        self._generation = Config.generation()
+
+    @staticmethod
+    def _fingerprint(sentinel_name):
+        return Config.get_sentinel_config(sentinel_name), Config.get_metrics_config()
+
+    def _group_lock(self, sentinel_name):
+        with self._lock:
+            lock = self._group_locks.get(sentinel_name)
+            if lock is None:
+                lock = self._group_locks[sentinel_name] = threading.Lock()
+            return lock
+
+    def get(self, sentinel_name):
+        """获取哨兵组客户端，首次访问时创建；同一组的并发首次访问只创建一次。"""
+        self.sync()
+        if Config.get_sentinel_config(sentinel_name) is None:
+            raise KeyError(f"Sentinel配置 '{sentinel_name}' 不存在")
+
+        entry = self._entries.get(sentinel_name)
+        if entry is not None:
+            return entry[1]
+        # 各组独立加锁，慢速的组不阻塞其他组的初始化
+        with self._group_lock(sentinel_name):
+            entry = self._entries.get(sentinel_name)
+            if entry is None:
+                entry = (self._fingerprint(sentinel_name), self.factory(sentinel_name))
+                self._entries[sentinel_name] = entry
+            return entry[1]
+
+    def register(self, sentinel_name, sentinel):
+        """以当前配置登记已创建的客户端。"""
+        with self._group_lock(sentinel_name):
+            self._entries[sentinel_name] = (self._fingerprint(sentinel_name), sentinel)
+
+    def sync(self):
+        """配置重新加载后关闭配置已变化或已删除的组，下次访问时按新配置重建。"""
+        generation = Config.generation()
+        if generation == self._generation:
+            return
+        with self._lock:
+            if generation == self._generation:
+                return
+            self._generation = generation
+            stale = [
+                (sentinel_name, entry[1])
+                for sentinel_name, entry in list(self._entries.items())
+                if self._fingerprint(sentinel_name) != entry[0]
+            ]
+            for sentinel_name, _ in stale:
+                self._entries.pop(sentinel_name, None)
+
+        for sentinel_name, sentinel in stale:
+            logging.info("哨兵组 %s 配置已变化，重建客户端", sentinel_name)
+            if self.on_discard is not None:
+                self.on_discard(sentinel_name)
+            try:
+                sentinel.close()
+            except Exception as exc:
+                logging.warning("关闭哨兵组 %s 的旧客户端失败: %s", sentinel_name, exc)
+
+    def warm_up(self, on_ready=None, sentinel_names=None):
+        """在后台线程中预先创建哨兵组客户端，默认包括所有已配置的组。"""
+        threads = []
+        if sentinel_names is None:
+            sentinel_names = Config.get_all_sentinel_names()
+        for sentinel_name in sentinel_names:
+            thread = threading.Thread(
+                target=self._warm_up_group,
+                args=(sentinel_name, on_ready),
+                name=f"kvdb-warm-up-{sentinel_name}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _warm_up_group(self, sentinel_name, on_ready):
+        try:
+            sentinel = self.get(sentinel_name)
+            if on_ready is not None:
+                on_ready(sentinel)
+        except Exception:
+            logging.exception("预热哨兵组 %s 失败", sentinel_name)
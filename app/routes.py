@@ -1,27 +1,84 @@
-from flask import Blueprint, current_app, render_template, request, Response, jsonify
+from flask import Blueprint, current_app, render_template, request, Response, jsonify, stream_with_context
 from .sentinel import RedisSentinel
-from .metrics import RedisMetricsCollector
+from .metrics import FORMAT_MEDIA_TYPES, FORMAT_TEXT, RedisMetricsCollector
+from .scheduler import CollectionScheduler, ScrapeSnapshot
+from .registry import SentinelRegistry
+from .terminal import BoundedOutput, CursorReply, iter_result_lines, needs_cursor
 from .config import Config
+import gzip
 import logging
+import redis
 import shlex
+import threading
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 bp = Blueprint('routes', __name__)
-_sentinel_clients = {}
+_scheduler = CollectionScheduler()
+_registry = SentinelRegistry(RedisSentinel, on_discard=_scheduler.discard)
 MAX_TERMINAL_OUTPUT_LENGTH = 20000
+# 流式返回终端输出时的字符上限
+MAX_TERMINAL_STREAM_LENGTH = 1000000
+# 流式输出中途失败时追加的错误行前缀，页面据此把最后一行显示为错误
+STREAM_ERROR_MARKER = "\n(error) "
+# 批量执行时单次请求允许的最大命令数
+MAX_TERMINAL_BATCH_SIZE = 100
+# 批量模式下由 transaction 参数控制事务，不允许手动发送的命令
+TERMINAL_TRANSACTION_COMMANDS = ('multi', 'exec', 'discard', 'watch', 'unwatch')
+STREAM_POLL_INTERVAL = 1
+STREAM_KEEPALIVE_INTERVAL = 15
+# 单个推送连接的最长时间，到期后浏览器自动重连，避免长期占用 worker 线程
+STREAM_MAX_DURATION = 300
+_stream_lock = threading.Lock()
+_active_streams = 0
+# 未启用后台采集时，/metrics 聚合接口并发实时采集各组所用的线程数上限
+AGGREGATE_MAX_WORKERS = 8
+_aggregate_pool = None
+_aggregate_pool_lock = threading.Lock()
 
 
 def get_sentinel_client(sentinel_name):
     """按哨兵组缓存客户端，避免每次请求重复建立Sentinel连接。"""
+    return _registry.get(sentinel_name)
+
+def get_group_snapshot(sentinel_name, deadline=None):
+    """返回 (客户端, 快照)；共享快照的跟随进程只读取快照，不创建客户端，此时客户端为 None。"""
     if Config.get_sentinel_config(sentinel_name) is None:
         raise KeyError(f"Sentinel配置 '{sentinel_name}' 不存在")
-
-    sentinel = _sentinel_clients.get(sentinel_name)
+    snapshot = _scheduler.shared_snapshot(sentinel_name)
+    if snapshot is not None:
+        return None, snapshot
+    sentinel = get_sentinel_client(sentinel_name)
+    return sentinel, _scheduler.get_snapshot(sentinel, deadline)
+
+def group_live_stats(sentinel, snapshot):
+    """实时指标的数据来源：共享快照模式下统一使用采集进程写入快照的统计，避免各 worker 输出不一致。"""
+    if snapshot.live_stats is not None:
+        return snapshot.live_stats
     if sentinel is None:
-        sentinel = RedisSentinel(sentinel_name)
-        _sentinel_clients[sentinel_name] = sentinel
-    return sentinel
+        return None
+    return _scheduler.live_stats(sentinel)
+
+def warm_up_sentinels():
+    """启动时预先创建哨兵组客户端；启用后台采集时同时完成首次采集，共享快照的跟随进程跳过。"""
+    def on_ready(sentinel):
+        if Config.get_metrics_config().get('collect_interval', 0) > 0:
+            _scheduler.get_snapshot(sentinel)
+    sentinel_names = [
+        sentinel_name for sentinel_name in Config.get_all_sentinel_names()
+        if _scheduler.shared_snapshot(sentinel_name) is None
+    ]
+    return _registry.warm_up(on_ready, sentinel_names)
+
+
+# /info/data?format=compact 的列顺序，与 build_node_data 的字段一致
+NODE_FIELDS = (
+    'master_name', 'host', 'port', 'role', 'up', 'timed_out', 'error', 'connected_clients',
+    'used_memory_human', 'total_system_memory_human', 'used_memory', 'maxmemory',
+    'instantaneous_ops_per_sec', 'uptime_in_seconds', 'uptime_in_days', 'version',
+    'is_kvrocks', 'type', 'total_keys', 'disk_capacity', 'used_disk_size',
+)
 
 
 def build_node_data(info):
@@ -36,12 +93,15 @@ def build_node_data(info):
             maxmemory = 0
 
     total_keys = info.get('total_keys', 0)
+    # 未在采集截止时间内完成的节点状态未知，up 置为 None，由页面显示为超时而非在线
+    timed_out = bool(info.get('timed_out', False))
     return {
         'master_name': info.get('master_name', 'unknown'),
         'host': info.get('host', 'unknown'),
         'port': info.get('port', 'unknown'),
         'role': info.get('node_role', 'unknown'),
-        'up': info.get('up', 1),
+        'up': None if timed_out else info.get('up', 1),
+        'timed_out': timed_out,
         'error': info.get('error', ''),
         'connected_clients': info.get('connected_clients', 0),
         'used_memory_human': info.get('used_memory_human', '0B'),
@@ -88,36 +148,136 @@ def validate_terminal_command(command_parts):
         raise PermissionError(f"命令 '{command_parts[0]}' 已被禁止")
 
 
-def format_redis_result(value):
-    if value is None:
-        return "(nil)"
-    if isinstance(value, bool):
-        return "1" if value else "0"
-    if isinstance(value, (bytes, bytearray)):
-        return value.decode('utf-8', errors='replace')
-    if isinstance(value, (int, float)):
-        return str(value)
-    if isinstance(value, str):
-        return value
-    if isinstance(value, dict):
-        lines = []
-        for key, item in value.items():
-            lines.append(f"{format_redis_result(key)}: {format_redis_result(item)}")
-        return "\n".join(lines)
-    if isinstance(value, (list, tuple, set)):
-        if not value:
-            return "(empty list or set)"
-        lines = []
-        for index, item in enumerate(value, start=1):
-            item_text = format_redis_result(item)
-            if "\n" in item_text:
-                lines.append(f"{index})")
-                lines.extend(f"   {line}" for line in item_text.splitlines())
-            else:
-                lines.append(f"{index}) {item_text}")
-        return "\n".join(lines)
+def parse_terminal_batch(commands):
+    """解析并校验批量命令列表，返回各命令的参数列表。"""
+    if not isinstance(commands, list) or not commands:
+        raise ValueError("commands 必须是非空列表")
+    if len(commands) > MAX_TERMINAL_BATCH_SIZE:
+        raise ValueError(f"单次最多执行 {MAX_TERMINAL_BATCH_SIZE} 条命令")
 
-    return str(value)
+    batch = []
+    for command in commands:
+        command_parts = parse_redis_command(str(command))
+        validate_terminal_command(command_parts)
+        if command_parts[0].lower() in TERMINAL_TRANSACTION_COMMANDS:
+            raise ValueError(f"批量模式不支持 '{command_parts[0]}'，请使用 transaction 参数")
+        if needs_cursor(command_parts):
+            # 流水线会一次性读入完整回复，可能返回海量元素的命令只能单条执行以分页读取
+            raise ValueError(f"批量模式不支持可能返回大量元素的命令 '{shlex.join(command_parts)}'，请单独执行")
+        batch.append(command_parts)
+    return batch
+
+
+def negotiate_metrics_format(accept_header=None):
+    """按 Accept 头的 q 值选择指标输出格式，无法匹配时使用经典文本格式"""
+    if accept_header is None:
+        accept_header = request.headers.get('Accept', '')
+    supported = dict(FORMAT_MEDIA_TYPES)
+    best_format, best_quality = FORMAT_TEXT, 0.0
+    for item in accept_header.split(','):
+        media_type, _, params = item.partition(';')
+        fmt = supported.get(media_type.strip().lower())
+        if fmt is None:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > best_quality:
+            best_format, best_quality = fmt, quality
+    return best_format
+
+def collect_shard_metrics(metrics_collector, sentinel_name, snapshot):
+    """记录本实例分片负责采集的节点数"""
+    metrics_config = Config.get_metrics_config()
+    metrics_collector.collect_shard_metrics(
+        sentinel_name,
+        metrics_config.get('shard_index', 0),
+        metrics_config.get('shard_count', 1),
+        snapshot.owned_nodes,
+    )
+
+def render_snapshot_metrics(snapshot, sentinel_name, timestamp=None, fmt=FORMAT_TEXT):
+    """渲染只依赖采集快照的指标文本"""
+    metrics_collector = RedisMetricsCollector(Config.get_metric_families())
+    metrics_collector.collect_scrape_metrics(
+        sentinel_name,
+        snapshot.success,
+        snapshot.duration,
+        snapshot.sentinel_status,
+    )
+    collect_shard_metrics(metrics_collector, sentinel_name, snapshot)
+    metrics_collector.collect_metrics(snapshot.redis_info, sentinel_name)
+    return metrics_collector.get_metrics(timestamp=timestamp, live=False, fmt=fmt)
+
+def build_metrics_response(rendered, live_body, content_type):
+    """组装指标响应：支持 If-None-Match 条件请求与 gzip 压缩"""
+    # ETag 只对应快照部分，快照未变化时抓取端可直接复用上次结果
+    if request.if_none_match.contains_weak(rendered.etag):
+        response = Response(status=304)
+        response.set_etag(rendered.etag, weak=True)
+        return response
+    
+    if request.accept_encodings['gzip']:
+        # 多个 gzip 成员直接拼接仍是合法的 gzip 流
+        response = Response(rendered.gzip_body + gzip.compress(live_body, compresslevel=6),
+                            content_type=content_type)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(rendered.body + live_body, content_type=content_type)
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    response.set_etag(rendered.etag, weak=True)
+    return response
+
+def parse_group_filter(all_names):
+    """解析 ?group= 参数（可重复或逗号分隔），未指定时返回全部哨兵组"""
+    requested = []
+    for value in request.args.getlist('group'):
+        requested.extend(name.strip() for name in value.split(',') if name.strip())
+    if not requested:
+        return list(all_names)
+
+    unknown = [name for name in requested if name not in all_names]
+    if unknown:
+        raise KeyError(f"Sentinel配置 '{', '.join(unknown)}' 不存在")
+    return list(OrderedDict.fromkeys(requested))
+
+def scrape_deadline():
+    """取配置的采集截止时间与 Prometheus 抓取超时（扣除渲染余量）中较小者，均未设置时返回 None"""
+    metrics_config = Config.get_metrics_config()
+    deadlines = []
+    if metrics_config.get('scrape_deadline'):
+        deadlines.append(metrics_config['scrape_deadline'])
+    header = request.headers.get('X-Prometheus-Scrape-Timeout-Seconds')
+    if header:
+        try:
+            deadlines.append(max(0.1, float(header) - metrics_config.get('scrape_timeout_offset', 0.5)))
+        except ValueError:
+            logging.debug("忽略无效的抓取超时请求头: %s", header)
+    return min(deadlines) if deadlines else None
+
+def get_aggregate_pool():
+    """返回 /metrics 聚合实时采集共用的线程池，首次使用时创建，避免在 gunicorn fork 前启动线程。
+
+    组任务会等待自身的节点采集任务，因此不能放进共享采集线程池，否则可能互相占满线程。
+    """
+    global _aggregate_pool
+    with _aggregate_pool_lock:
+        if _aggregate_pool is None:
+            _aggregate_pool = ThreadPoolExecutor(max_workers=AGGREGATE_MAX_WORKERS, thread_name_prefix='kvdb-aggregate')
+        return _aggregate_pool
+
+def collect_group_snapshot(sentinel_name, deadline=None):
+    """获取单个哨兵组的客户端与快照，失败时返回失败快照"""
+    try:
+        return get_group_snapshot(sentinel_name, deadline)
+    except Exception as e:
+        logging.error("采集哨兵组 %s 失败: %s", sentinel_name, e)
+        return None, ScrapeSnapshot(sentinel_name, {}, False, 0, error=str(e))
 
 @bp.route('/')
 def index():
@@ -131,31 +291,96 @@ def favicon():
     """浏览器默认favicon入口"""
     return current_app.send_static_file('favicon.ico')
 
+@bp.route('/metrics')
+def aggregate_metrics():
+    """聚合多个哨兵组的Prometheus指标接口"""
+    try:
+        sentinel_names = parse_group_filter(Config.get_all_sentinel_names())
+        fmt = negotiate_metrics_format()
+        deadline = scrape_deadline()
+        
+        # 启用后台采集时只读取内存或共享文件中的快照，顺序读取即可；
+        # 实时采集时各组在有界线程池中并发执行。单个组失败只影响该组的采集状态指标
+        if Config.get_metrics_config().get('collect_interval', 0) > 0 or len(sentinel_names) <= 1:
+            results = [collect_group_snapshot(sentinel_name, deadline) for sentinel_name in sentinel_names]
+        else:
+            results = list(get_aggregate_pool().map(
+                collect_group_snapshot, sentinel_names, [deadline] * len(sentinel_names)
+            ))
+        
+        metrics_collector = RedisMetricsCollector(Config.get_metric_families())
+        executor_stats = None
+        for sentinel_name, (sentinel, snapshot) in zip(sentinel_names, results):
+            live_stats = group_live_stats(sentinel, snapshot)
+            metrics_collector.collect_scrape_metrics(
+                sentinel_name,
+                snapshot.success,
+                snapshot.duration,
+                snapshot.sentinel_status,
+            )
+            collect_shard_metrics(metrics_collector, sentinel_name, snapshot)
+            if live_stats is not None:
+                metrics_collector.collect_snapshot_metrics(sentinel_name, snapshot.age, live_stats['coalesced'])
+                metrics_collector.collect_pool_metrics(sentinel_name, live_stats['pool'])
+                metrics_collector.collect_breaker_metrics(sentinel_name, live_stats['breaker'])
+                if executor_stats is None:
+                    executor_stats = dict(live_stats['executor'], groups={})
+                # 各组的线程池排队情况取自负责该组采集的进程
+                group_stats = live_stats['executor']['groups'].get(sentinel_name)
+                if group_stats is not None:
+                    executor_stats['groups'][sentinel_name] = group_stats
+            else:
+                metrics_collector.collect_snapshot_metrics(sentinel_name, snapshot.age)
+            metrics_collector.collect_metrics(snapshot.redis_info, sentinel_name)
+        
+        if executor_stats is not None:
+            metrics_collector.collect_executor_metrics(executor_stats)
+        
+        body = metrics_collector.get_metrics(fmt=fmt)
+        content_type = metrics_collector.get_content_type(fmt)
+        if request.accept_encodings['gzip']:
+            response = Response(gzip.compress(body, compresslevel=6), content_type=content_type)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(body, content_type=content_type)
+        response.headers['Vary'] = 'Accept, Accept-Encoding'
+        return response
+    except KeyError as e:
+        logging.warning("获取指标失败: %s", str(e))
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        logging.error(f"获取指标失败: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/<sentinel_name>/metrics')
 def metrics(sentinel_name):
     """Prometheus指标接口"""
     try:
-        # 创建新的指标收集器实例，避免线程安全问题
-        metrics_collector = RedisMetricsCollector()
-        
-        # 获取Redis Sentinel客户端
-        sentinel = get_sentinel_client(sentinel_name)
+        # 读取最新采集快照（未启用后台采集时实时采集）
+        sentinel, snapshot = get_group_snapshot(sentinel_name, scrape_deadline())
+        timestamp = snapshot.collected_at if Config.get_metrics_config().get('series_timestamps') else None
+        fmt = negotiate_metrics_format()
         
-        # 收集所有Redis节点信息
-        redis_info = sentinel.collect_all_redis_info()
-        
-        # 收集Prometheus指标
-        metrics_collector.collect_scrape_metrics(
-            sentinel_name,
-            sentinel.last_scrape_success,
-            sentinel.last_scrape_duration,
-            sentinel.sentinel_status,
+        # 快照指标同一快照按格式只渲染、压缩一次，后续请求直接复用
+        rendered = snapshot.get_rendered(
+            (fmt, timestamp is not None),
+            lambda: render_snapshot_metrics(snapshot, sentinel_name, timestamp, fmt),
         )
-        metrics_collector.collect_metrics(redis_info, sentinel_name)
         
-        # 返回指标数据
-        return Response(metrics_collector.get_metrics(), 
-                       content_type=metrics_collector.get_content_type())
+        # 实时指标（快照年龄、连接池、熔断、线程池）每次请求单独渲染后追加
+        # 共享快照模式下这些统计来自采集进程写入的快照，快照尚未就绪时只输出快照年龄
+        live_collector = RedisMetricsCollector(Config.get_metric_families())
+        live_stats = group_live_stats(sentinel, snapshot)
+        if live_stats is not None:
+            live_collector.collect_snapshot_metrics(sentinel_name, snapshot.age, live_stats['coalesced'])
+            live_collector.collect_pool_metrics(sentinel_name, live_stats['pool'])
+            live_collector.collect_breaker_metrics(sentinel_name, live_stats['breaker'])
+            live_collector.collect_executor_metrics(live_stats['executor'], sentinel_name)
+        else:
+            live_collector.collect_snapshot_metrics(sentinel_name, snapshot.age)
+        
+        return build_metrics_response(rendered, live_collector.get_metrics(live=True, fmt=fmt),
+                                      live_collector.get_content_type(fmt))
     except KeyError as e:
         logging.warning("获取指标失败: %s", str(e))
         return jsonify({'error': str(e)}), 404
@@ -178,61 +403,176 @@ def info(sentinel_name):
         logging.error(f"获取信息页面失败: {str(e)}")
         return render_template('error.html', error=str(e))
 
+def master_sort_key(master_name):
+    """主节点组按名称末尾的数字排序，如 mymaster-2 排在 mymaster-10 之前。"""
+    suffix = master_name.rsplit('-', 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+def build_info_payload(sentinel_name, snapshot):
+    """将采集快照整理为 /info/data 的返回结构：每个主节点组包含其从节点。"""
+    redis_info = snapshot.redis_info
+
+    # 准备模板数据
+    masters = {}
+    slaves = {}
+
+    # 整理主节点和从节点数据
+    for info in redis_info.values():
+        master_name = info.get('master_name', 'unknown')
+        role = info.get('node_role', 'unknown')
+        node_data = build_node_data(info)
+
+        if role == 'master':
+            if master_name not in masters:
+                masters[master_name] = []
+            masters[master_name].append(node_data)
+        else:
+            if master_name not in slaves:
+                slaves[master_name] = []
+            slaves[master_name].append(node_data)
+
+    # 创建新的nodes数组结构，每个主节点包含对应的从节点
+    nodes = []
+
+    # 将主节点和从节点整合进新结构
+    for master_name in sorted(masters, key=master_sort_key):
+        # 为每个主节点组创建一个节点组对象；故障切换期间同组可能出现多个主节点，
+        # 从节点只挂在第一个主节点下，避免重复输出
+        group_slaves = slaves.get(master_name, [])
+        for master_node in masters[master_name]:
+            node_group = {**master_node}
+            node_group['slaves'] = group_slaves
+            group_slaves = []
+            nodes.append(node_group)
+
+    # 使用有序字典创建返回数据
+    response_data = OrderedDict()
+    response_data['sentinel_name'] = sentinel_name
+    response_data['nodes'] = nodes  # 使用新的整合结构
+    response_data['timestamp'] = int(snapshot.collected_at)
+    return response_data
+
+def parse_page_args(args):
+    """解析紧凑格式的 offset/limit/sort/filter 参数，非法时抛出 ValueError。"""
+    try:
+        offset = int(args.get('offset', 0))
+        limit = int(args['limit']) if args.get('limit') not in (None, '') else None
+    except ValueError:
+        raise ValueError("offset/limit 必须是整数") from None
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset/limit 不能为负数")
+
+    sort = str(args.get('sort', '')).strip()
+    if sort and sort.lstrip('-') not in NODE_FIELDS:
+        raise ValueError(f"不支持的排序字段: {sort.lstrip('-')}")
+    return offset, limit, sort, str(args.get('filter', '')).strip().lower()
+
+def _field_sort_key(value):
+    # 同一列可能混有数字与 'unknown' 等字符串，数字排在前面
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, '')
+    return (1, 0, str(value))
+
+def build_compact_payload(sentinel_name, snapshot, offset=0, limit=None, sort='', keyword=''):
+    """列式返回节点数据：fields 给出列名，rows 每行一个节点，支持过滤、排序与分页。"""
+    nodes = [build_node_data(info) for info in snapshot.redis_info.values()]
+    if keyword:
+        nodes = [
+            node for node in nodes
+            if keyword in str(node['master_name']).lower() or keyword in f"{node['host']}:{node['port']}".lower()
+        ]
+
+    # 默认按主节点组排序，组内主节点在前，再按地址排序
+    nodes.sort(key=lambda node: (
+        master_sort_key(str(node['master_name'])), str(node['master_name']),
+        node['role'] != 'master', str(node['host']), _field_sort_key(node['port']),
+    ))
+    if sort:
+        field = sort.lstrip('-')
+        nodes.sort(key=lambda node: _field_sort_key(node[field]), reverse=sort.startswith('-'))
+
+    total = len(nodes)
+    page = nodes[offset:] if limit is None else nodes[offset:offset + limit]
+
+    response_data = OrderedDict()
+    response_data['sentinel_name'] = sentinel_name
+    response_data['timestamp'] = int(snapshot.collected_at)
+    response_data['total'] = total
+    response_data['offset'] = offset
+    response_data['limit'] = limit
+    response_data['fields'] = list(NODE_FIELDS)
+    response_data['rows'] = [[node[field] for field in NODE_FIELDS] for node in page]
+    return response_data
+
+def node_field_map(snapshot):
+    """按节点地址展开快照中的节点数据，用于计算推送增量。"""
+    return {
+        node_key: build_node_data(info)
+        for node_key, info in snapshot.redis_info.items()
+    }
+
+def diff_node_fields(previous, current):
+    """对比两次快照的节点数据，返回 (各节点变化的字段, 拓扑是否变化)。
+
+    节点增减或主从角色变化时拓扑视为变化，此时需要重新推送全量数据。
+    """
+    if previous.keys() != current.keys():
+        return {}, True
+
+    changed = {}
+    for node_key, fields in current.items():
+        old_fields = previous[node_key]
+        if (old_fields['role'], old_fields['master_name']) != (fields['role'], fields['master_name']):
+            return {}, True
+        node_changes = {
+            field: value
+            for field, value in fields.items()
+            if old_fields.get(field) != value
+        }
+        if node_changes:
+            changed[node_key] = node_changes
+    return changed, False
+
+def acquire_stream_slot():
+    """占用一个推送连接名额，超过 web_ui.max_streams 时返回 False。"""
+    global _active_streams
+    with _stream_lock:
+        if _active_streams >= Config.get_web_ui_config().get('max_streams', 4):
+            return False
+        _active_streams += 1
+        return True
+
+def release_stream_slot():
+    global _active_streams
+    with _stream_lock:
+        _active_streams -= 1
+
+def format_sse_event(event, data):
+    from flask import json
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @bp.route('/<sentinel_name>/info/data')
 def info_data(sentinel_name):
-    """API - 返回Redis节点详细信息的JSON数据，用于AJAX请求"""
-    try:
-        # 获取Redis Sentinel客户端
-        sentinel = get_sentinel_client(sentinel_name)
-        
-        # 收集所有Redis节点信息
-        redis_info = sentinel.collect_all_redis_info()
-        
-        # 准备模板数据
-        masters = {}
-        slaves = {}
-        
-        # 整理主节点和从节点数据
-        for info in redis_info.values():
-            master_name = info.get('master_name', 'unknown')
-            role = info.get('node_role', 'unknown')
-            node_data = build_node_data(info)
-            
-            if role == 'master':
-                if master_name not in masters:
-                    masters[master_name] = []
-                masters[master_name].append(node_data)
-            else:
-                if master_name not in slaves:
-                    slaves[master_name] = []
-                slaves[master_name].append(node_data)
-        
-        # 使用有序字典保持顺序
-        sorted_masters = OrderedDict()
-        for master_name in sorted(masters.keys(), key=lambda x: int(x.split('-')[-1]) if x.split('-')[-1].isdigit() else 0):
-            sorted_masters[master_name] = masters[master_name]
+    """API - 返回Redis节点详细信息的JSON数据，用于AJAX请求
+
+    ?format=compact 时返回列式数据，并支持 offset/limit/sort/filter 参数分页。
+    """
+    data_format = request.args.get('format', 'nested')
+    if data_format not in ('nested', 'compact'):
+        return jsonify({'error': f"不支持的数据格式: {data_format}"}), 400
+    if data_format == 'compact':
+        try:
+            page_args = parse_page_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        # 创建新的nodes数组结构，每个主节点包含对应的从节点
-        nodes = []
-        
-        # 将主节点和从节点整合进新结构
-        for master_name, master_nodes in sorted_masters.items():
-            # 为每个主节点组创建一个节点组对象
-            for master_node in master_nodes:
-                # 复制主节点数据
-                node_group = {**master_node}
-                
-                # 添加slaves字段，包含所有对应的从节点
-                node_group['slaves'] = slaves.get(master_name, [])
-                
-                # 添加到nodes数组
-                nodes.append(node_group)
-        
-        # 使用有序字典创建返回数据
-        response_data = OrderedDict()
-        response_data['sentinel_name'] = sentinel_name
-        response_data['nodes'] = nodes  # 使用新的整合结构
-        response_data['timestamp'] = int(time.time())
+    try:
+        # 读取最新采集快照
+        _, snapshot = get_group_snapshot(sentinel_name)
+        if data_format == 'compact':
+            response_data = build_compact_payload(sentinel_name, snapshot, *page_args)
+        else:
+            response_data = build_info_payload(sentinel_name, snapshot)
         
         # 返回JSON响应
         from flask import json
@@ -247,6 +587,71 @@ def info_data(sentinel_name):
         logging.error(f"获取节点详情数据失败: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/<sentinel_name>/info/stream')
+def info_stream(sentinel_name):
+    """API - 以SSE推送节点数据：首次发送全量，之后只发送变化的节点字段。
+
+    数据来自后台采集快照，多个浏览器共享同一份快照，不会额外访问Redis。
+    """
+    if Config.get_sentinel_config(sentinel_name) is None:
+        return jsonify({'error': f"Sentinel配置 '{sentinel_name}' 不存在"}), 404
+    # 推送连接长期占用 worker 线程，超出上限时拒绝，页面会回退为轮询
+    if not acquire_stream_slot():
+        return jsonify({'error': '推送连接数已达上限，请使用轮询'}), 503
+
+    if Config.get_metrics_config().get('collect_interval', 0) > 0:
+        # 后台采集模式下读取快照只是内存/文件检查，可以频繁轮询
+        poll_interval = STREAM_POLL_INTERVAL
+    else:
+        # 未启用后台采集时每次读取快照都会实时采集，按页面刷新间隔限速
+        poll_interval = Config.get_web_ui_config().get('refresh_interval', 30)
+
+    def generate():
+        last_snapshot = None
+        last_fields = None
+        last_sent_at = time.monotonic()
+        expires_at = last_sent_at + STREAM_MAX_DURATION
+        yield f"retry: {int(poll_interval * 1000)}\n\n"
+        while time.monotonic() < expires_at:
+            try:
+                _, snapshot = get_group_snapshot(sentinel_name)
+            except Exception as e:
+                logging.error("推送节点数据失败: %s", e)
+                yield format_sse_event('failure', {'error': str(e)})
+                return
+
+            if snapshot is not last_snapshot:
+                fields = node_field_map(snapshot)
+                if last_fields is None:
+                    yield format_sse_event('full', build_info_payload(sentinel_name, snapshot))
+                    last_sent_at = time.monotonic()
+                else:
+                    changed, topology_changed = diff_node_fields(last_fields, fields)
+                    if topology_changed:
+                        yield format_sse_event('full', build_info_payload(sentinel_name, snapshot))
+                        last_sent_at = time.monotonic()
+                    else:
+                        # 字段未变化时仍推送时间戳，让页面显示最新采集时间
+                        yield format_sse_event('delta', {
+                            'nodes': changed,
+                            'timestamp': int(snapshot.collected_at),
+                        })
+                        last_sent_at = time.monotonic()
+                last_snapshot = snapshot
+                last_fields = fields
+
+            if time.monotonic() - last_sent_at >= STREAM_KEEPALIVE_INTERVAL:
+                # 注释行保持连接，避免被代理判定为空闲
+                yield ': keepalive\n\n'
+                last_sent_at = time.monotonic()
+            time.sleep(poll_interval)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.call_on_close(release_stream_slot)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @bp.route('/<sentinel_name>/nodes')
 def nodes(sentinel_name):
     """API - 返回所有Redis节点的JSON数据"""
@@ -295,38 +700,96 @@ def nodes(sentinel_name):
         return jsonify({'error': str(e)}), 500
 
 
+def stream_terminal_output(result):
+    """以分块文本流式返回命令结果，边从Redis分页读取边发送，总量受 MAX_TERMINAL_STREAM_LENGTH 限制。"""
+    chunks = iter(BoundedOutput(iter_result_lines(result), MAX_TERMINAL_STREAM_LENGTH))
+    # 先取首个分块，连接失败、类型错误等仍可在响应开始前以JSON返回
+    first = next(chunks, '')
+
+    def generate():
+        yield first
+        try:
+            yield from chunks
+        except Exception as e:
+            logging.warning("Redis Terminal流式输出中断: %s", str(e))
+            yield f"{STREAM_ERROR_MARKER}{e}"
+
+    response = Response(stream_with_context(generate()), mimetype='text/plain')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def execute_terminal_batch(sentinel, host, port, master_name, batch, transaction, started_at):
+    """以一次流水线执行批量命令并逐条返回结果。
+
+    流水线只在全部命令返回后得到结果，因此耗时只统计整批命令。
+    """
+    try:
+        replies = sentinel.execute_redis_pipeline(host, port, master_name, batch, transaction=transaction)
+    except redis.ResponseError as e:
+        # 事务中任一命令入队失败（参数个数错误、未知命令等）时 EXEC 整体中止
+        return jsonify({'error': str(e), 'transaction': transaction}), 400
+    results = []
+    for command_parts, reply in zip(batch, replies):
+        if isinstance(reply, Exception):
+            results.append({'command': shlex.join(command_parts), 'ok': False, 'error': str(reply)})
+            continue
+        output = BoundedOutput(iter_result_lines(reply), MAX_TERMINAL_OUTPUT_LENGTH)
+        results.append({
+            'command': shlex.join(command_parts),
+            'ok': True,
+            'output': output.text(),
+            'truncated': output.truncated,
+        })
+
+    return jsonify({
+        'ok': True,
+        'transaction': transaction,
+        'results': results,
+        'duration_ms': round((time.time() - started_at) * 1000, 2),
+    })
+
 @bp.route('/<sentinel_name>/terminal/execute', methods=['POST'])
 def terminal_execute(sentinel_name):
-    """API - 在指定Redis节点执行单条Redis命令"""
+    """API - 在指定Redis节点执行Redis命令
+
+    传入 commands 列表时批量执行：所有命令通过一次流水线发送，transaction 为真时使用 MULTI/EXEC。
+    """
     try:
         payload = request.get_json(silent=True) or {}
         host = str(payload.get('host', '')).strip()
         port = int(payload.get('port'))
         master_name = str(payload.get('master_name', '')).strip()
-        command = str(payload.get('command', '')).strip()
 
         if not host or not master_name:
             return jsonify({'error': 'host 和 master_name 不能为空'}), 400
 
-        command_parts = parse_redis_command(command)
-        validate_terminal_command(command_parts)
+        if 'commands' in payload:
+            batch = parse_terminal_batch(payload['commands'])
+        else:
+            command_parts = parse_redis_command(str(payload.get('command', '')).strip())
+            validate_terminal_command(command_parts)
 
         sentinel = get_sentinel_client(sentinel_name)
         if not sentinel.is_known_node(host, port, master_name):
             return jsonify({'error': '目标Redis节点不属于当前Sentinel发现结果'}), 403
 
         started_at = time.time()
+        if 'commands' in payload:
+            return execute_terminal_batch(sentinel, host, port, master_name, batch,
+                                          bool(payload.get('transaction')), started_at)
+
         result = sentinel.execute_redis_command(host, port, master_name, command_parts)
-        output = format_redis_result(result)
-        truncated = False
-        if len(output) > MAX_TERMINAL_OUTPUT_LENGTH:
-            output = output[:MAX_TERMINAL_OUTPUT_LENGTH] + "\n... output truncated ..."
-            truncated = True
+        # stream 表示客户端支持流式读取；只有分页读取的结果才流式返回，其他命令仍受 MAX_TERMINAL_OUTPUT_LENGTH 限制
+        if payload.get('stream') and isinstance(result, CursorReply):
+            return stream_terminal_output(result)
+
+        output = BoundedOutput(iter_result_lines(result), MAX_TERMINAL_OUTPUT_LENGTH)
+        text = output.text()
 
         return jsonify({
             'ok': True,
-            'output': output,
-            'truncated': truncated,
+            'output': text,
+            'truncated': output.truncated,
             'duration_ms': round((time.time() - started_at) * 1000, 2),
         })
     except KeyError as e:
@@ -0,0 +1,245 @@
+import gzip
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+
+from .config import Config
+from .executor import get_shared_executor
+from .shared_snapshot import SharedSnapshotStore
+
+
+class RenderedExposition:
+    """缓存的指标文本及其 gzip 压缩版本与 ETag。"""
+
+    def __init__(self, body, variant=''):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6)
+        # 不同输出格式的正文可能相同，ETag 需区分格式
+        self.etag = hashlib.sha1(variant.encode('utf-8') + body).hexdigest()
+
+
+class ScrapeSnapshot:
+    """一次完整采集结果的只读快照。"""
+
+    def __init__(self, sentinel_name, redis_info, success, duration, error='', sentinel_status=None,
+                 collected_at=None, owned_nodes=0, live_stats=None):
+        self.sentinel_name = sentinel_name
+        self.redis_info = redis_info
+        self.success = success
+        self.duration = duration
+        self.error = error
+        self.sentinel_status = sentinel_status or []
+        self.collected_at = collected_at if collected_at is not None else time.time()
+        self.owned_nodes = owned_nodes
+        # 共享快照模式下由采集进程写入的连接池、熔断、线程池等统计，各 worker 据此输出一致的实时指标
+        self.live_stats = live_stats
+        self._rendered = {}
+        self._render_lock = threading.Lock()
+
+    @property
+    def age(self):
+        """快照距今的秒数。"""
+        return max(0.0, time.time() - self.collected_at)
+
+    def get_rendered(self, key, render):
+        """按 key 缓存渲染结果，同一快照只渲染一次。"""
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            with self._render_lock:
+                rendered = self._rendered.get(key)
+                if rendered is None:
+                    rendered = RenderedExposition(render(), repr(key))
+                    self._rendered[key] = rendered
+        return rendered
+
+
+class SingleFlight:
+    """合并同一 key 的并发调用，等待中的调用方共享同一次执行结果。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._coalesced = defaultdict(int)
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+            else:
+                self._coalesced[key] += 1
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def coalesced(self, key):
+        """累计被合并（未单独执行）的调用次数。"""
+        with self._lock:
+            return self._coalesced[key]
+
+
+class CollectionScheduler:
+    """按哨兵组在后台周期性采集，并在内存中保存最新快照。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        # sentinel_name -> (采集线程, 停止事件)
+        self._workers = {}
+        # sentinel_name -> 丢弃次数，用于识别 discard 之前开始、之后才结束的过期采集
+        self._generations = defaultdict(int)
+        self._single_flight = SingleFlight()
+        self._store = None
+
+    @staticmethod
+    def _collect_interval():
+        return Config.get_metrics_config().get('collect_interval', 0)
+
+    def _shared_store(self):
+        """按配置返回多进程共享快照目录，未配置时返回 None。"""
+        directory = Config.get_metrics_config().get('shared_snapshot_dir')
+        if not directory:
+            return None
+        with self._lock:
+            if self._store is None or self._store.directory != directory:
+                if not SharedSnapshotStore.available():
+                    logging.warning("当前平台不支持文件锁，忽略 shared_snapshot_dir 配置")
+                    return None
+                self._store = SharedSnapshotStore(directory)
+            return self._store
+
+    def collect(self, sentinel, deadline=None):
+        """立即采集一次并更新该组的快照；同组并发调用合并为一次采集，沿用首个调用方的截止时间。"""
+        return self._single_flight.do(sentinel.sentinel_name, lambda: self._collect(sentinel, deadline))
+
+    def coalesced_requests(self, sentinel_name):
+        return self._single_flight.coalesced(sentinel_name)
+
+    def live_stats(self, sentinel):
+        """本进程内该组的连接池、熔断、线程池与合并请求统计。"""
+        return {
+            'coalesced': self.coalesced_requests(sentinel.sentinel_name),
+            'pool': sentinel.pool_stats(),
+            'breaker': sentinel.breaker_stats(),
+            'executor': get_shared_executor().stats(),
+        }
+
+    def shared_snapshot(self, sentinel_name):
+        """多进程共享模式下，未持有采集锁的进程直接读取共享快照；本进程负责采集时返回 None。
+
+        跟随进程无需创建哨兵组客户端，接管采集锁后才由调用方创建客户端开始采集。
+        """
+        if self._collect_interval() <= 0:
+            return None
+        store = self._shared_store()
+        if store is None or store.try_lead(sentinel_name):
+            return None
+        snapshot = store.read(sentinel_name, ScrapeSnapshot)
+        if snapshot is None:
+            snapshot = ScrapeSnapshot(sentinel_name, {}, False, 0, error='shared snapshot not ready')
+        return snapshot
+
+    def _collect(self, sentinel, deadline=None):
+        generation = self._generations[sentinel.sentinel_name]
+        redis_info = sentinel.collect_all_redis_info(deadline)
+        store = self._shared_store()
+        leading = store is not None and store.is_leader(sentinel.sentinel_name)
+        snapshot = ScrapeSnapshot(
+            sentinel.sentinel_name,
+            redis_info,
+            sentinel.last_scrape_success,
+            sentinel.last_scrape_duration,
+            sentinel.last_scrape_error,
+            [dict(status) for status in sentinel.sentinel_status],
+            owned_nodes=sentinel.last_owned_nodes,
+            live_stats=self.live_stats(sentinel) if leading else None,
+        )
+        with self._lock:
+            # 采集期间该组已被 discard（客户端已关闭重建），结果不再写回
+            if generation != self._generations[sentinel.sentinel_name]:
+                return snapshot
+            self._snapshots[sentinel.sentinel_name] = snapshot
+        if leading:
+            try:
+                store.write(snapshot)
+            except (OSError, TypeError, ValueError) as exc:
+                logging.warning("写入哨兵组 %s 的共享快照失败: %s", sentinel.sentinel_name, exc)
+        return snapshot
+
+    def get_snapshot(self, sentinel, deadline=None):
+        """获取最新快照；未启用后台采集时退化为实时采集，deadline 为本次采集的秒数上限。"""
+        interval = self._collect_interval()
+        if interval <= 0:
+            return self.collect(sentinel, deadline)
+
+        # 多进程部署时只有持锁进程采集，其余进程读取共享快照
+        snapshot = self.shared_snapshot(sentinel.sentinel_name)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = self._snapshots.get(sentinel.sentinel_name)
+        if snapshot is None:
+            snapshot = self.collect(sentinel, deadline)
+        self._ensure_worker(sentinel, interval)
+        return snapshot
+
+    def _ensure_worker(self, sentinel, interval):
+        with self._lock:
+            worker = self._workers.get(sentinel.sentinel_name)
+            if worker is not None and worker[0].is_alive():
+                return
+
+            stop_event = threading.Event()
+            thread = threading.Thread(
+                target=self._run,
+                args=(sentinel, interval, stop_event),
+                name=f"kvdb-collector-{sentinel.sentinel_name}",
+                daemon=True,
+            )
+            self._workers[sentinel.sentinel_name] = (thread, stop_event)
+            thread.start()
+
+    def _run(self, sentinel, interval, stop_event):
+        logging.info("启动哨兵组 %s 的后台采集，间隔 %s 秒", sentinel.sentinel_name, interval)
+        while not stop_event.wait(interval):
+            try:
+                self.collect(sentinel)
+            except Exception:
+                logging.exception("哨兵组 %s 后台采集失败", sentinel.sentinel_name)
+
+    def discard(self, sentinel_name):
+        """停止该组的后台采集并丢弃快照，客户端重建后重新开始。"""
+        with self._lock:
+            worker = self._workers.pop(sentinel_name, None)
+            self._snapshots.pop(sentinel_name, None)
+            self._generations[sentinel_name] += 1
+        if worker is not None:
+            worker[1].set()
+            worker[0].join(timeout=1)
+
+    def stop(self):
+        """停止所有后台采集线程。"""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for _, stop_event in workers:
+            stop_event.set()
+        for thread, _ in workers:
+            thread.join(timeout=1)
@@ -1,16 +1,29 @@
 import logging
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError, as_completed
 
 import redis
 
+from .breaker import CircuitBreaker
 from .config import Config
+from .executor import get_shared_executor
+from .pool import ConnectionPoolRegistry
+from .sentinel_clients import SentinelClientManager
+from .sharding import HashRing
+from .terminal import cursor_reply
+from .topology import TopologyEventListener, TopologySnapshot
 
 
 ENGINE_REDIS = 1
 ENGINE_KVROCKS = 2
 ENGINE_PIKA = 3
 
+INFO_MODE_ALL = 'all'
+INFO_MODE_PIPELINE = 'pipeline'
+# INFO all 中与现有指标无关、数量较多的段落
+INFO_ALL_DROPPED_PREFIXES = ('errorstat_', 'latency_percentiles_usec_')
+
 
 class RedisSentinel:
     def __init__(self, sentinel_name):
@@ -29,125 +42,224 @@ class RedisSentinel:
         self.connect_timeout = metrics_config.get('connect_timeout', 3)
         self.read_timeout = metrics_config.get('read_timeout', 5)
         self.discovery_ttl = metrics_config.get('discovery_ttl', 30)
+        self.topology_events = metrics_config.get('topology_events', True)
+        self.topology_sweep_interval = metrics_config.get('topology_sweep_interval', 300)
+        self.pool_registry = ConnectionPoolRegistry(
+            self.connect_timeout,
+            self.read_timeout,
+            metrics_config.get('pool_idle_timeout', 300),
+        )
+
+        self.shard_index = metrics_config.get('shard_index', 0)
+        self.shard_count = metrics_config.get('shard_count', 1)
+        self._hash_ring = HashRing(self.shard_count) if self.shard_count > 1 else None
+
+        # 启用的可选 INFO 段落（commandstats、keyspace）
+        self.info_sections = Config.get_info_sections()
+        # 可选段落的刷新间隔（秒），未到期时复用节点缓存
+        self.section_intervals = metrics_config.get('section_intervals', {})
+        self._section_cache = {}
+
+        self.breaker = CircuitBreaker(
+            metrics_config.get('breaker_threshold', 3),
+            metrics_config.get('breaker_backoff', 5),
+            metrics_config.get('breaker_max_backoff', 300),
+        )
+
+        self.scrape_deadline = metrics_config.get('scrape_deadline', 0)
+        # 超过采集截止时间仍在执行的节点任务，下次采集直接复用
+        self._inflight = {}
 
-        self.sentinel_clients = []
-        self.sentinel_status = []
+        self._node_capabilities = {}
+        self.collection_engine = metrics_config.get('collection_engine', 'thread')
+        self._async_engine = None
+        if self.collection_engine == 'asyncio':
+            from .async_engine import AsyncCollectionEngine
+
+            self._async_engine = AsyncCollectionEngine(
+                self,
+                metrics_config.get('async_concurrency', 200),
+                metrics_config.get('node_deadline') or self.connect_timeout + self.read_timeout,
+            )
+
+        self.sentinel_manager = SentinelClientManager(
+            sentinel_name,
+            self.sentinel_hosts,
+            self._create_sentinel_client,
+            metrics_config.get('sentinel_probe_interval', 10),
+        )
         self.all_master_names = []
-        self._last_discovery_at = 0
+        self._topology = None
+        self._topology_lock = threading.Lock()
+        self._topology_listener = None
 
         self.last_scrape_success = False
         self.last_scrape_duration = 0
         self.last_scrape_error = ""
+        self.last_owned_nodes = 0
 
-        self._create_sentinel_clients()
+        self.sentinel_manager.probe()
+        self.sentinel_manager.start()
         self.refresh_master_names(force=True)
 
-    def _create_sentinel_clients(self):
-        """创建Sentinel客户端连接"""
-        clients = []
-        status = []
-        for sentinel in self.sentinel_hosts:
-            host = sentinel['host']
-            port = sentinel['port']
-            client = redis.Redis(
-                host=host,
-                port=port,
-                socket_timeout=self.connect_timeout,
-                socket_connect_timeout=self.connect_timeout,
-                decode_responses=True,
-            )
-            try:
-                client.ping()
-                clients.append(client)
-                status.append({'host': host, 'port': port, 'up': 1, 'error': ''})
-            except redis.RedisError as exc:
-                status.append({'host': host, 'port': port, 'up': 0, 'error': str(exc)})
-                logging.warning("无法连接到Sentinel %s:%s - %s", host, port, exc)
+    def _create_sentinel_client(self, host, port):
+        return redis.Redis(
+            host=host,
+            port=port,
+            socket_timeout=self.connect_timeout,
+            socket_connect_timeout=self.connect_timeout,
+            decode_responses=True,
+        )
 
-        if not clients:
-            logging.error("无法连接到任何Sentinel服务器")
+    @property
+    def sentinel_status(self):
+        """各Sentinel的实时在线状态与延迟。"""
+        return self.sentinel_manager.status()
 
-        self.sentinel_clients = clients
-        self.sentinel_status = status
+    @staticmethod
+    def _is_healthy_slave(slave):
+        is_connected = not slave.get('is_disconnected', True)
+        flags = str(slave.get('flags', '')).lower()
+        return is_connected and 'down' not in flags
+
+    def _query_masters(self):
+        return self.sentinel_manager.query(lambda client: client.sentinel_masters(), "获取master列表") or {}
+
+    def _query_slaves(self, master_name):
+        slaves_info = self.sentinel_manager.query(
+            lambda client: client.sentinel_slaves(master_name),
+            f"获取从节点信息(master_name={master_name})",
+        )
+        return [slave for slave in slaves_info or [] if self._is_healthy_slave(slave)]
+
+    def _build_topology(self):
+        """一次 SENTINEL MASTERS 加并发的 SENTINEL SLAVES 构建拓扑快照。"""
+        masters = self._query_masters()
+        if not masters:
+            return None
+
+        slaves = {}
+        executor = get_shared_executor()
+        future_to_name = {
+            executor.submit(self.sentinel_name, self.thread_pool_size, self._query_slaves, master_name): master_name
+            for master_name in masters
+        }
+        for future in as_completed(future_to_name):
+            master_slaves = future.result()
+            if master_slaves:
+                slaves[future_to_name[future]] = master_slaves
 
-    def refresh_master_names(self, force=False):
-        """按TTL刷新master名称列表。"""
-        now = time.time()
-        if not force and self.all_master_names and now - self._last_discovery_at < self.discovery_ttl:
-            return self.all_master_names
+        return TopologySnapshot(masters, slaves)
 
-        if not self.sentinel_clients:
-            self._create_sentinel_clients()
+    def _topology_ttl(self):
+        """事件订阅正常时拓扑由事件修补，完整发现只作为低频一致性校验。"""
+        if self._topology_listener is not None and self._topology_listener.connected:
+            return max(self.discovery_ttl, self.topology_sweep_interval)
+        return self.discovery_ttl
 
-        discovered = []
-        for client in self.sentinel_clients:
-            try:
-                masters_info = client.sentinel_masters()
-                if masters_info:
-                    discovered = sorted(masters_info.keys())
-                    break
-            except redis.RedisError as exc:
-                logging.warning("从Sentinel获取master列表失败: %s", exc)
-
-        if discovered:
-            self.all_master_names = discovered
-            self._last_discovery_at = now
-            logging.info("从Sentinel发现%d个master: %s", len(discovered), ", ".join(discovered))
-        elif not self.all_master_names:
-            logging.warning("无法从任何Sentinel获取master列表")
-
-        return self.all_master_names
+    def _create_event_client(self, host, port):
+        return redis.Redis(
+            host=host,
+            port=port,
+            socket_connect_timeout=self.connect_timeout,
+            socket_keepalive=True,
+            health_check_interval=30,
+            decode_responses=True,
+        )
+
+    def _start_topology_listener(self):
+        if not self.topology_events or self._topology_listener is not None:
+            return
+        self._topology_listener = TopologyEventListener(
+            self.sentinel_name,
+            self.sentinel_hosts,
+            self._create_event_client,
+            self._on_topology_event,
+            on_connect=self.invalidate_topology,
+        )
+        self._topology_listener.start()
+
+    def invalidate_topology(self):
+        """让下一次读取拓扑时重新完整发现。"""
+        with self._topology_lock:
+            if self._topology is not None:
+                self._topology = TopologySnapshot(self._topology.masters, self._topology.slaves, built_at=0)
+
+    def _on_topology_event(self, channel, data):
+        logging.info("哨兵组 %s 收到Sentinel事件 %s: %s", self.sentinel_name, channel, data)
+        with self._topology_lock:
+            topology = self._topology
+            if topology is None:
+                return
+            patched = topology.apply_event(channel, data)
+            if patched is None:
+                patched = TopologySnapshot(topology.masters, topology.slaves, built_at=0)
+            self._topology = patched
+            self.all_master_names = patched.master_names
+
+    def get_topology(self, force=False):
+        """缓存的拓扑快照，按TTL或事件触发重新发现。"""
+        topology = self._topology
+        if not force and topology is not None and topology.is_fresh(self._topology_ttl()):
+            return topology
+
+        with self._topology_lock:
+            topology = self._topology
+            if not force and topology is not None and topology.is_fresh(self._topology_ttl()):
+                return topology
+
+            rebuilt = self._build_topology()
+            if rebuilt is not None:
+                self._topology = rebuilt
+                self.all_master_names = rebuilt.master_names
+                logging.info("从Sentinel发现%d个master: %s", len(rebuilt.master_names), ", ".join(rebuilt.master_names))
+            elif topology is None:
+                logging.warning("无法从任何Sentinel获取master列表")
+
+            if self._topology is not None:
+                self._start_topology_listener()
+        return self._topology or TopologySnapshot({}, {}, built_at=0)
+
+    def refresh_master_names(self, force=False):
+        """按TTL刷新master名称列表。"""
+        return self.get_topology(force=force).master_names
 
     def get_master_by_name(self, master_name):
         """通过master_name获取主节点信息"""
-        self.refresh_master_names()
-        for client in self.sentinel_clients:
-            try:
-                master_info = client.sentinel_master(master_name)
-                if master_info:
-                    return master_info
-            except redis.RedisError as exc:
-                logging.warning("从Sentinel获取主节点信息失败: %s, master_name: %s", exc, master_name)
-
-        return None
+        return self.get_topology().masters.get(master_name)
 
     def get_slaves_by_name(self, master_name):
         """通过master_name获取从节点信息"""
-        self.refresh_master_names()
-        for client in self.sentinel_clients:
-            try:
-                slaves_info = client.sentinel_slaves(master_name)
-                if slaves_info:
-                    connected_slaves = []
-                    for slave in slaves_info:
-                        is_connected = not slave.get('is_disconnected', True)
-                        flags = str(slave.get('flags', '')).lower()
-                        is_not_down = 'down' not in flags
-                        if is_connected and is_not_down:
-                            connected_slaves.append(slave)
-
-                    return connected_slaves
-            except redis.RedisError as exc:
-                logging.warning("从Sentinel获取从节点信息失败: %s, master_name: %s", exc, master_name)
-
-        return []
+        return list(self.get_topology().slaves.get(master_name, []))
 
     def get_all_masters(self):
         """获取所有主节点信息"""
-        return {
-            master_name: master_info
-            for master_name in self.refresh_master_names()
-            if (master_info := self.get_master_by_name(master_name))
-        }
+        return dict(self.get_topology().masters)
 
     def get_all_slaves(self):
         """获取所有从节点信息"""
-        slaves_info = {}
-        for master_name in self.refresh_master_names():
-            slaves = self.get_slaves_by_name(master_name)
-            if slaves:
-                slaves_info[master_name] = slaves
-        return slaves_info
+        return {master_name: list(slaves) for master_name, slaves in self.get_topology().slaves.items()}
+
+    def close(self):
+        """停止事件订阅与Sentinel探测，并关闭节点连接池。"""
+        self.sentinel_manager.close()
+        if self._topology_listener is not None:
+            self._topology_listener.stop()
+            self._topology_listener = None
+        if self._async_engine is not None:
+            self._async_engine.close()
+        self.pool_registry.close()
+
+    def breaker_stats(self):
+        """返回节点熔断状态。"""
+        return self.breaker.stats()
+
+    def pool_stats(self):
+        """当前采集引擎使用的节点连接池统计。"""
+        stats = self.pool_registry.stats()
+        if self._async_engine is not None:
+            stats.extend(self._async_engine.pool_registry.stats())
+        return stats
 
     def get_redis_password(self, master_name):
         """获取特定主节点的密码"""
@@ -158,40 +270,43 @@ class RedisSentinel:
         return self.default_password
 
     def get_redis_client(self, host, port, master_name):
-        """获取Redis客户端连接"""
-        return redis.Redis(
-            host=host,
-            port=port,
-            password=self.get_redis_password(master_name),
-            socket_timeout=self.read_timeout,
-            socket_connect_timeout=self.connect_timeout,
-            decode_responses=True,
-        )
+        """获取复用连接池的Redis客户端"""
+        return self.pool_registry.get_client(host, port, self.get_redis_password(master_name))
 
     def is_known_node(self, host, port, master_name):
         """确认目标Redis节点来自当前Sentinel发现结果，避免任意地址连接。"""
         try:
-            target_port = int(port)
+            node = (str(host), int(port), str(master_name))
         except (TypeError, ValueError):
             return False
 
-        for node in self._discover_nodes():
-            if (
-                str(node.get('host')) == str(host)
-                and int(node.get('port')) == target_port
-                and str(node.get('master_name')) == str(master_name)
-            ):
-                return True
-        return False
+        # 已缓存拓扑（由事件持续修补）命中时直接放行，未命中再按TTL重新发现确认
+        topology = self._topology
+        if topology is not None and node in topology.node_index:
+            return True
+        return node in self.get_topology().node_index
 
     def execute_redis_command(self, host, port, master_name, command_parts):
-        """在指定Redis节点执行命令。"""
+        """在指定Redis节点执行命令，复用节点连接池，连接失效由连接池重连。
+
+        可能返回海量元素的命令返回按页读取的 CursorReply，由调用方按输出上限消费。
+        """
         client = self.get_redis_client(host, port, master_name)
-        try:
-            client.ping()
-            return client.execute_command(*command_parts)
-        finally:
-            client.close()
+        reply = cursor_reply(client, command_parts)
+        if reply is not None:
+            return reply
+        return client.execute_command(*command_parts)
+
+    def execute_redis_pipeline(self, host, port, master_name, commands, transaction=False):
+        """在指定Redis节点以一次流水线执行多条命令，transaction 为真时包裹在 MULTI/EXEC 中。
+
+        单条命令失败时对应位置返回异常对象，不影响其他命令的结果。
+        """
+        client = self.get_redis_client(host, port, master_name)
+        pipe = client.pipeline(transaction=transaction)
+        for command_parts in commands:
+            pipe.execute_command(*command_parts)
+        return pipe.execute(raise_on_error=False)
 
     @staticmethod
     def detect_engine(info):
@@ -230,13 +345,21 @@ class RedisSentinel:
             'error': error,
         }
 
-    def _read_kvrocks_total_keys(self, client, info):
-        try:
-            keyspace_info = client.execute_command('info', 'keyspace')
-        except redis.RedisError as exc:
-            logging.debug("获取KVRocks键总数失败: %s", exc)
-            return
+    @staticmethod
+    def _timed_out_node(host, port, master_name, node_role):
+        """未在采集截止时间内完成的节点：不含 up 字段，避免慢节点被当作下线。"""
+        return {
+            'host': host,
+            'port': port,
+            'master_name': master_name,
+            'node_role': node_role,
+            'type': ENGINE_REDIS,
+            'error': "scrape deadline exceeded",
+            'timed_out': True,
+        }
 
+    @staticmethod
+    def _apply_kvrocks_keyspace(info, keyspace_info):
         if isinstance(keyspace_info, dict) and 'total_keys' in keyspace_info:
             info['total_keys'] = keyspace_info['total_keys']
             return
@@ -250,33 +373,176 @@ class RedisSentinel:
                         pass
                     return
 
+    @staticmethod
+    def _split_info_all(info):
+        """把 INFO all 的结果拆成基础信息和 commandstats 两部分。"""
+        command_stats = {}
+        for key in list(info):
+            if key.startswith('cmdstat_'):
+                command_stats[key] = info.pop(key)
+            elif key.startswith(INFO_ALL_DROPPED_PREFIXES):
+                info.pop(key)
+        return info, command_stats
+
+    def _preferred_info_mode(self, node_type):
+        """Redis 与 Pika 支持单条 INFO all；KVRocks 需额外读取 keyspace，使用流水线。
+
+        未启用 commandstats 时普通 INFO 已是单次往返，无需读取 INFO all。
+        """
+        if node_type == ENGINE_KVROCKS or 'commandstats' not in self.info_sections:
+            return INFO_MODE_PIPELINE
+        return INFO_MODE_ALL
+
+    def _optional_sections(self, node_type):
+        """返回 (是否读取 commandstats, 是否读取 KVRocks keyspace)。"""
+        return (
+            'commandstats' in self.info_sections,
+            node_type == ENGINE_KVROCKS and 'keyspace' in self.info_sections,
+        )
+
+    def _section_due(self, node_key, section, now):
+        interval = self.section_intervals.get(section, 0)
+        if interval <= 0:
+            return True
+        entry = self._section_cache.get(node_key, {}).get(section)
+        return entry is None or now - entry[0] >= interval
+
+    def _due_sections(self, node_key, node_type, now=None):
+        """返回本次需要读取的 (commandstats, KVRocks keyspace)；未到刷新间隔的段落使用缓存。"""
+        now = now if now is not None else time.time()
+        with_commandstats, with_keyspace = self._optional_sections(node_type)
+        return (
+            with_commandstats and self._section_due(node_key, 'commandstats', now),
+            with_keyspace and self._section_due(node_key, 'keyspace', now),
+        )
+
+    def _merge_sections(self, node_key, node_type, command_stats, keyspace_info, fetched_commandstats, fetched_keyspace):
+        """缓存本次读取的慢段落，未读取的段落取自缓存。"""
+        now = time.time()
+        cache = self._section_cache.setdefault(node_key, {})
+        with_commandstats, with_keyspace = self._optional_sections(node_type)
+        for section, enabled, fetched, value in (
+            ('commandstats', with_commandstats, fetched_commandstats, command_stats),
+            ('keyspace', with_keyspace, fetched_keyspace, keyspace_info),
+        ):
+            if not enabled or self.section_intervals.get(section, 0) <= 0:
+                continue
+            if fetched:
+                cache[section] = (now, value)
+            elif section in cache:
+                if section == 'commandstats':
+                    command_stats = cache[section][1]
+                else:
+                    keyspace_info = cache[section][1]
+        return command_stats, keyspace_info
+
+    def _forget_node(self, node_key):
+        """节点采集失败或已下线时丢弃其能力与段落缓存，下次重新探测。"""
+        self._node_capabilities.pop(node_key, None)
+        self._section_cache.pop(node_key, None)
+
+    def _fetch_with_pipeline(self, client, with_commandstats, with_keyspace):
+        if not with_commandstats and not with_keyspace:
+            return client.info(), {}, None
+
+        pipe = client.pipeline(transaction=False)
+        pipe.info()
+        if with_commandstats:
+            pipe.info('commandstats')
+        if with_keyspace:
+            pipe.execute_command('info', 'keyspace')
+        replies = pipe.execute(raise_on_error=False)
+
+        info = replies[0]
+        if isinstance(info, Exception):
+            raise info
+        command_stats = {}
+        if with_commandstats and not isinstance(replies[1], Exception):
+            command_stats = replies[1]
+        keyspace_info = None
+        if with_keyspace:
+            if isinstance(replies[-1], Exception):
+                logging.debug("获取KVRocks键总数失败: %s", replies[-1])
+            else:
+                keyspace_info = replies[-1]
+        return info, command_stats, keyspace_info
+
+    def _fetch_node_info(self, client, node_key):
+        """按节点能力以最少的往返次数读取 INFO 与到期的 commandstats、keyspace。"""
+        capability = self._node_capabilities.get(node_key)
+        node_type = capability['engine'] if capability is not None else ENGINE_REDIS
+        due_commandstats, due_keyspace = self._due_sections(node_key, node_type)
+
+        fetched = None
+        if capability is not None and capability['info_mode'] == INFO_MODE_ALL and due_commandstats:
+            try:
+                info, command_stats = self._split_info_all(client.info('all'))
+            except redis.ResponseError as exc:
+                logging.info("节点 %s:%s 不支持 INFO all，改用流水线采集: %s", node_key[0], node_key[1], exc)
+                capability['info_mode'] = INFO_MODE_PIPELINE
+            else:
+                if command_stats or not capability['has_commandstats']:
+                    fetched = info, command_stats, None
+                else:
+                    logging.info("节点 %s:%s 的 INFO all 不含 commandstats，改用流水线采集", node_key[0], node_key[1])
+                    capability['info_mode'] = INFO_MODE_PIPELINE
+
+        if fetched is None:
+            fetched = self._fetch_with_pipeline(client, due_commandstats, due_keyspace)
+        info, command_stats, keyspace_info = fetched
+
+        detected_type = self.detect_engine(info)
+        if capability is None or capability['engine'] != detected_type:
+            # 首次探测时尚不知道引擎类型，KVRocks 需补一次 keyspace 读取
+            if node_type != ENGINE_KVROCKS and self._optional_sections(detected_type)[1]:
+                try:
+                    keyspace_info = client.execute_command('info', 'keyspace')
+                    due_keyspace = True
+                except redis.RedisError as exc:
+                    logging.debug("获取KVRocks键总数失败: %s", exc)
+            self._section_cache.pop(node_key, None)
+            self._node_capabilities[node_key] = {
+                'engine': detected_type,
+                'info_mode': self._preferred_info_mode(detected_type),
+                'has_commandstats': bool(command_stats),
+            }
+        return (info,) + self._merge_sections(
+            node_key, detected_type, command_stats, keyspace_info, due_commandstats, due_keyspace
+        )
+
+    def _build_node_info(self, host, port, master_name, node_role, info, command_stats=None, keyspace_info=None):
+        if command_stats:
+            info['commandstats'] = command_stats
+
+        node_type = self.detect_engine(info)
+        info.update({
+            'up': 1,
+            'master_name': master_name,
+            'node_role': node_role,
+            'host': host,
+            'port': port,
+            'type': node_type,
+            'is_kvrocks': node_type == ENGINE_KVROCKS,
+        })
+
+        if 'keyspace' not in self.info_sections:
+            for key in [key for key, value in info.items() if key.startswith('db') and isinstance(value, dict)]:
+                info.pop(key)
+        elif node_type == ENGINE_KVROCKS and keyspace_info is not None:
+            self._apply_kvrocks_keyspace(info, keyspace_info)
+
+        total_keys = self.calculate_total_keys(info)
+        if total_keys:
+            info['total_keys'] = total_keys
+        return info
+
     def collect_redis_info(self, host, port, master_name, node_role):
         """收集Redis节点的信息"""
         client = self.get_redis_client(host, port, master_name)
+        node_key = (str(host), int(port))
         try:
-            client.ping()
-            info = client.info()
-            command_stats = client.info('commandstats')
-            if command_stats:
-                info['commandstats'] = command_stats
-
-            node_type = self.detect_engine(info)
-            info.update({
-                'up': 1,
-                'master_name': master_name,
-                'node_role': node_role,
-                'host': host,
-                'port': port,
-                'type': node_type,
-                'is_kvrocks': node_type == ENGINE_KVROCKS,
-            })
-
-            if node_type == ENGINE_KVROCKS:
-                self._read_kvrocks_total_keys(client, info)
-
-            total_keys = self.calculate_total_keys(info)
-            if total_keys:
-                info['total_keys'] = total_keys
+            info, command_stats, keyspace_info = self._fetch_node_info(client, node_key)
+            info = self._build_node_info(host, port, master_name, node_role, info, command_stats, keyspace_info)
 
             logging.debug(
                 "完成Redis节点采集 host=%s port=%s master=%s role=%s engine=%s",
@@ -284,68 +550,23 @@ class RedisSentinel:
                 port,
                 master_name,
                 node_role,
-                node_type,
+                info['type'],
             )
             return info
         except redis.RedisError as exc:
+            # 节点可能被替换为其他引擎，下次重新探测
+            self._forget_node(node_key)
             logging.warning("从Redis %s:%s 获取信息失败, master_name=%s - %s", host, port, master_name, exc)
             return self._failed_node(host, port, master_name, node_role, str(exc))
-        finally:
-            client.close()
 
     def _discover_nodes(self):
-        all_nodes = []
-
-        for master_name, master_info in self.get_all_masters().items():
-            host = master_info.get('ip')
-            port = master_info.get('port')
-            if host and port:
-                all_nodes.append({
-                    'host': host,
-                    'port': port,
-                    'master_name': master_name,
-                    'node_role': 'master',
-                })
-
-        for master_name, slaves in self.get_all_slaves().items():
-            for slave in slaves:
-                host = slave.get('ip')
-                port = slave.get('port')
-                if host and port:
-                    all_nodes.append({
-                        'host': host,
-                        'port': port,
-                        'master_name': master_name,
-                        'node_role': 'slave',
-                    })
-
-        return all_nodes
-
-    def collect_all_redis_info(self):
-        """并行收集所有Redis节点的信息"""
-        start_time = time.time()
-        self.last_scrape_success = False
-        self.last_scrape_error = ""
-        results = {}
-
-        all_nodes = self._discover_nodes()
-        if not all_nodes:
-            self.last_scrape_duration = time.time() - start_time
-            self.last_scrape_error = "no redis nodes discovered"
-            return results
-
-        with ThreadPoolExecutor(max_workers=self.thread_pool_size) as executor:
-            future_to_node = {
-                executor.submit(
-                    self.collect_redis_info,
-                    node['host'],
-                    node['port'],
-                    node['master_name'],
-                    node['node_role'],
-                ): node for node in all_nodes
-            }
+        return list(self.get_topology().nodes)
 
-            for future in as_completed(future_to_node):
+    def _gather_results(self, future_to_node, timeout=None):
+        """收集已完成的节点结果；超过 timeout 秒仍未完成的节点不在返回结果中。"""
+        results = {}
+        try:
+            for future in as_completed(future_to_node, timeout=timeout):
                 node = future_to_node[future]
                 node_key = f"{node['host']}:{node['port']}"
                 try:
@@ -359,9 +580,111 @@ class RedisSentinel:
                         node['node_role'],
                         str(exc),
                     )
+        except FuturesTimeoutError:
+            pass
+        return results
+
+    def _owned_nodes(self, nodes):
+        """分片模式下只保留一致性哈希分配给本实例的节点。"""
+        if self._hash_ring is None:
+            return nodes
+        return self._hash_ring.owned(nodes, self.shard_index)
+
+    def _submit_node(self, node):
+        """按采集引擎提交单个节点的采集任务，返回 Future。"""
+        if self._async_engine is not None:
+            return self._async_engine.submit(node)
+        return get_shared_executor().submit(
+            self.sentinel_name,
+            self.thread_pool_size,
+            self.collect_redis_info,
+            node['host'],
+            node['port'],
+            node['master_name'],
+            node['node_role'],
+        )
+
+    def collect_all_redis_info(self, deadline=None):
+        """并行收集所有Redis节点的信息；超过 deadline 秒未完成的节点标记为超时，结果留给下次采集"""
+        start_time = time.time()
+        if deadline is None:
+            deadline = self.scrape_deadline or None
+        self.last_scrape_success = False
+        self.last_scrape_error = ""
+        results = {}
+
+        discovered_nodes = self._discover_nodes()
+        all_nodes = self._owned_nodes(discovered_nodes)
+        self.last_owned_nodes = len(all_nodes)
+        addresses = [(node['host'], node['port']) for node in all_nodes]
+        self.pool_registry.retain(addresses)
+        self.pool_registry.reap_idle()
+        if self._async_engine is not None:
+            self._async_engine.pool_registry.retain(addresses)
+            self._async_engine.pool_registry.reap_idle()
+        discovered = {(str(node['host']), int(node['port'])) for node in all_nodes}
+        for node_key in set(self._node_capabilities) | set(self._section_cache) | set(self._inflight):
+            if node_key not in discovered:
+                self._forget_node(node_key)
+                self._inflight.pop(node_key, None)
+        if not all_nodes:
+            self.last_scrape_duration = time.time() - start_time
+            if discovered_nodes:
+                # 节点均分配给了其他分片，本实例无需采集
+                self.last_scrape_success = True
+            else:
+                self.last_scrape_error = "no redis nodes discovered"
+            return results
+
+        # 熔断中的节点直接记为下线，不占用采集线程等待连接超时；
+        # 上次超时遗留的任务（含半开探测）不经熔断判断，直接复用并在完成后记录结果
+        self.breaker.retain(addresses)
+        live_nodes = []
+        for node in all_nodes:
+            if (str(node['host']), int(node['port'])) in self._inflight or self.breaker.allow(node['host'], node['port']):
+                live_nodes.append(node)
+            else:
+                results[f"{node['host']}:{node['port']}"] = self._failed_node(
+                    node['host'], node['port'], node['master_name'], node['node_role'], "circuit breaker open"
+                )
+
+        future_to_node = {}
+        for node in live_nodes:
+            # 上次超时的节点复用仍在执行或已完成的任务，不重复下发
+            future = self._inflight.pop((str(node['host']), int(node['port'])), None)
+            if future is None:
+                future = self._submit_node(node)
+            future_to_node[future] = node
+
+        remaining = None
+        if deadline:
+            remaining = max(0.0, deadline - (time.time() - start_time))
+        collected = self._gather_results(future_to_node, remaining)
+        for future, node in future_to_node.items():
+            node_key = f"{node['host']}:{node['port']}"
+            if node_key not in collected:
+                self._inflight[(str(node['host']), int(node['port']))] = future
+                results[node_key] = self._timed_out_node(
+                    node['host'], node['port'], node['master_name'], node['node_role']
+                )
+            elif collected[node_key].get('up') == 1:
+                self.breaker.record_success(node['host'], node['port'])
+            else:
+                self.breaker.record_failure(node['host'], node['port'])
+        results.update(collected)
+        if len(collected) < len(future_to_node):
+            logging.warning(
+                "哨兵组 %s 采集超过 %s 秒，%d 个节点未完成",
+                self.sentinel_name,
+                deadline,
+                len(future_to_node) - len(collected),
+            )
 
         self.last_scrape_duration = time.time() - start_time
-        self.last_scrape_success = bool(results) and all(info.get('up') == 1 for info in results.values())
+        # 仅因截止时间未完成的节点不视为失败，由 kvdb_node_scrape_timed_out 单独反映
+        self.last_scrape_success = bool(results) and all(
+            info.get('up') == 1 or info.get('timed_out') for info in results.values()
+        )
         if not self.last_scrape_success:
             self.last_scrape_error = "one or more redis nodes failed"
 
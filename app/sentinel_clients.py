@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+
+import redis
+
+
+class SentinelClientManager:
+    """管理哨兵组内的Sentinel客户端：后台重新探测失败实例，按观测延迟排序查询。"""
+
+    # 延迟的指数滑动平均系数
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, sentinel_name, sentinel_hosts, client_factory, probe_interval=10):
+        self.sentinel_name = sentinel_name
+        self.client_factory = client_factory
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._entries = [
+            {
+                'host': sentinel['host'],
+                'port': sentinel['port'],
+                'client': None,
+                'up': 0,
+                'error': 'not probed',
+                'latency': None,
+            }
+            for sentinel in sentinel_hosts
+        ]
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _client(self, entry):
+        if entry['client'] is None:
+            entry['client'] = self.client_factory(entry['host'], entry['port'])
+        return entry['client']
+
+    def _mark_up(self, entry, elapsed):
+        with self._lock:
+            latency = entry['latency']
+            entry['latency'] = elapsed if latency is None else (
+                latency + self.LATENCY_SMOOTHING * (elapsed - latency)
+            )
+            entry['up'] = 1
+            entry['error'] = ''
+
+    def _mark_down(self, entry, exc):
+        with self._lock:
+            entry['up'] = 0
+            entry['error'] = str(exc)
+
+    def probe(self):
+        """PING 所有Sentinel，更新在线状态与延迟。"""
+        for entry in self._entries:
+            started_at = time.perf_counter()
+            try:
+                self._client(entry).ping()
+            except redis.RedisError as exc:
+                if entry['up']:
+                    logging.warning("Sentinel %s:%s 探测失败: %s", entry['host'], entry['port'], exc)
+                self._mark_down(entry, exc)
+            else:
+                if not entry['up']:
+                    logging.info("Sentinel %s:%s 已恢复", entry['host'], entry['port'])
+                self._mark_up(entry, time.perf_counter() - started_at)
+        if self._entries and not any(entry['up'] for entry in self._entries):
+            logging.error("无法连接到哨兵组 %s 的任何Sentinel服务器", self.sentinel_name)
+
+    def start(self):
+        """启动后台探测线程。"""
+        if self._thread is not None or not self._entries or self.probe_interval <= 0:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"kvdb-sentinel-probe-{self.sentinel_name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.probe_interval):
+            try:
+                self.probe()
+            except Exception:
+                logging.exception("哨兵组 %s 探测Sentinel失败", self.sentinel_name)
+
+    def close(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _ordered(self):
+        """在线实例按延迟升序；全部离线时按配置顺序逐个尝试。"""
+        with self._lock:
+            healthy = [entry for entry in self._entries if entry['up']]
+            if not healthy:
+                return list(self._entries)
+            return sorted(healthy, key=lambda entry: entry['latency'] if entry['latency'] is not None else float('inf'))
+
+    def query(self, operation, description):
+        """按延迟顺序依次执行 operation(client)，返回首个非空结果。"""
+        for entry in self._ordered():
+            started_at = time.perf_counter()
+            try:
+                result = operation(self._client(entry))
+            except (redis.ConnectionError, redis.TimeoutError) as exc:
+                self._mark_down(entry, exc)
+                logging.warning("从Sentinel %s:%s %s失败: %s", entry['host'], entry['port'], description, exc)
+                continue
+            except redis.RedisError as exc:
+                # Sentinel 正常应答了错误（如 master 已被移除），实例本身仍在线
+                logging.warning("从Sentinel %s:%s %s失败: %s", entry['host'], entry['port'], description, exc)
+                continue
+            self._mark_up(entry, time.perf_counter() - started_at)
+            if result:
+                return result
+        return None
+
+    def status(self):
+        """返回各Sentinel的实时状态。"""
+        with self._lock:
+            return [
+                {
+                    'host': entry['host'],
+                    'port': entry['port'],
+                    'up': entry['up'],
+                    'error': entry['error'],
+                    'latency': entry['latency'],
+                }
+                for entry in self._entries
+            ]
@@ -0,0 +1,29 @@
+import bisect
+import hashlib
+
+
+class HashRing:
+    """按 host:port 一致性哈希把节点分配给各分片，分片数变化时只迁移少量节点。"""
+
+    def __init__(self, shard_count, vnodes=160):
+        self.shard_count = shard_count
+        ring = sorted(
+            (self._hash(f"shard-{shard}#{vnode}"), shard)
+            for shard in range(shard_count)
+            for vnode in range(vnodes)
+        )
+        self._hashes = [point for point, _ in ring]
+        self._shards = [shard for _, shard in ring]
+
+    @staticmethod
+    def _hash(key):
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+    def shard_for(self, host, port):
+        """返回节点所属的分片序号。"""
+        index = bisect.bisect(self._hashes, self._hash(f"{host}:{port}"))
+        return self._shards[index % len(self._shards)]
+
+    def owned(self, nodes, shard_index):
+        """从节点列表中筛选属于 shard_index 的节点。"""
+        return [node for node in nodes if self.shard_for(node['host'], node['port']) == shard_index]
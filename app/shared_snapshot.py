@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - 非 POSIX 平台不支持跨进程共享
+    fcntl = None
+
+
+class SharedSnapshotStore:
+    """多进程共享的采集快照目录：每个哨兵组由持有文件锁的进程采集，其余进程只读取快照文件。"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._lock_files = {}
+        # sentinel_name -> (mtime_ns, snapshot)，文件未变化时复用同一快照对象及其渲染缓存
+        self._cache = {}
+
+    @staticmethod
+    def available():
+        return fcntl is not None
+
+    def _path(self, sentinel_name, suffix):
+        return os.path.join(self.directory, f"{sentinel_name}.{suffix}")
+
+    def try_lead(self, sentinel_name):
+        """尝试成为该组的采集进程；持锁进程退出后由其他进程接管。"""
+        with self._lock:
+            if sentinel_name in self._lock_files:
+                return True
+            lock_file = open(self._path(sentinel_name, 'lock'), 'a+')
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._lock_files[sentinel_name] = lock_file
+            logging.info("进程 %s 负责采集哨兵组 %s 并共享快照", os.getpid(), sentinel_name)
+            return True
+
+    def is_leader(self, sentinel_name):
+        return sentinel_name in self._lock_files
+
+    def write(self, snapshot):
+        """原子写入快照文件。"""
+        payload = {
+            'sentinel_name': snapshot.sentinel_name,
+            'redis_info': snapshot.redis_info,
+            'success': snapshot.success,
+            'duration': snapshot.duration,
+            'error': snapshot.error,
+            'sentinel_status': snapshot.sentinel_status,
+            'collected_at': snapshot.collected_at,
+            'owned_nodes': snapshot.owned_nodes,
+            'live_stats': snapshot.live_stats,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{snapshot.sentinel_name}.")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str)
+            os.replace(temp_path, self._path(snapshot.sentinel_name, 'json'))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def read(self, sentinel_name, snapshot_class):
+        """读取其他进程写入的快照，不存在时返回 None。"""
+        path = self._path(sentinel_name, 'json')
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = self._cache.get(sentinel_name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as exc:
+            logging.warning("读取共享快照 %s 失败: %s", path, exc)
+            return cached[1] if cached is not None else None
+
+        snapshot = snapshot_class(
+            payload['sentinel_name'],
+            payload['redis_info'],
+            payload['success'],
+            payload['duration'],
+            payload.get('error', ''),
+            payload.get('sentinel_status'),
+            collected_at=payload.get('collected_at'),
+            owned_nodes=payload.get('owned_nodes', 0),
+            live_stats=payload.get('live_stats'),
+        )
+        self._cache[sentinel_name] = (mtime_ns, snapshot)
+        return snapshot
+
+    def close(self):
+        """释放所有采集锁。"""
+        with self._lock:
+            lock_files = list(self._lock_files.values())
+            self._lock_files.clear()
+        for lock_file in lock_files:
+            lock_file.close()
@@ -0,0 +1,178 @@
+# 游标分页每次向Redis请求的元素数
+SCAN_PAGE_SIZE = 1000
+# 流式输出时每个分块的大致字符数
+STREAM_CHUNK_SIZE = 8192
+TRUNCATED_MARKER = "\n... output truncated ..."
+# 按下标分段读取的命令及获取总长度的客户端方法
+RANGED_COMMANDS = {
+    'lrange': ('LRANGE', 'llen'),
+    'zrange': ('ZRANGE', 'zcard'),
+}
+
+
+def _format_scalar(value):
+    if value is None:
+        return "(nil)"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _iter_pairs(pairs):
+    for key, item in pairs:
+        yield f"{_format_scalar(key)}: {format_redis_result(item)}"
+
+
+def _iter_numbered(items):
+    empty = True
+    for index, item in enumerate(items, start=1):
+        empty = False
+        item_text = format_redis_result(item)
+        if "\n" in item_text:
+            yield f"{index})"
+            for line in item_text.splitlines():
+                yield f"   {line}"
+        else:
+            yield f"{index}) {item_text}"
+    if empty:
+        yield "(empty list or set)"
+
+
+class CursorReply:
+    """按页从Redis拉取的集合结果，kind 为 'list' 或 'dict'。"""
+
+    def __init__(self, kind, items):
+        self.kind = kind
+        self.items = items
+
+
+def iter_result_lines(value):
+    """逐行生成命令结果的文本，调用方可随时停止而不必格式化完整结果。"""
+    if isinstance(value, CursorReply):
+        if value.kind == 'dict':
+            return _iter_pairs(value.items)
+        return _iter_numbered(value.items)
+    if isinstance(value, dict):
+        return _iter_pairs(value.items())
+    if isinstance(value, (list, tuple, set)):
+        return _iter_numbered(value)
+    return iter((_format_scalar(value),))
+
+
+def format_redis_result(value):
+    return "\n".join(iter_result_lines(value))
+
+
+class BoundedOutput:
+    """把结果行拼接为不超过 limit 个字符的文本分块，超出部分丢弃并标记 truncated。"""
+
+    def __init__(self, lines, limit, chunk_size=STREAM_CHUNK_SIZE):
+        self.lines = lines
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.truncated = False
+
+    def __iter__(self):
+        remaining = self.limit
+        buffer = []
+        buffered = 0
+        for index, line in enumerate(self.lines):
+            text = line if index == 0 else "\n" + line
+            if len(text) > remaining:
+                buffer.append(text[:remaining])
+                buffer.append(TRUNCATED_MARKER)
+                self.truncated = True
+                break
+            remaining -= len(text)
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= self.chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def text(self):
+        return "".join(self)
+
+
+def _normalize_range(start, stop, length):
+    """按Redis语义把 start/stop（可为负数）换算为闭区间下标。"""
+    if start < 0:
+        start = max(length + start, 0)
+    if stop < 0:
+        stop = length + stop
+    return start, min(stop, length - 1)
+
+
+def _iter_ranged(client, command, key, start, stop, length, extra=(), page_size=SCAN_PAGE_SIZE):
+    start, stop = _normalize_range(start, stop, length)
+    while start <= stop:
+        page_stop = min(start + page_size - 1, stop)
+        yield from client.execute_command(command, key, start, page_stop, *extra)
+        start = page_stop + 1
+
+
+def _ranged_args(args):
+    """解析 LRANGE/ZRANGE 的 start/stop 及 WITHSCORES；带其他选项时返回 None。"""
+    if len(args) not in (3, 4):
+        return None
+    extra = tuple(args[3:])
+    if extra and str(extra[0]).lower() != 'withscores':
+        return None
+    try:
+        return int(args[1]), int(args[2]), extra
+    except ValueError:
+        return None
+
+
+def needs_cursor(command_parts, page_size=SCAN_PAGE_SIZE):
+    """命令是否可能返回海量元素、需要经 cursor_reply 分页读取。
+
+    LRANGE/ZRANGE 的下标均非负且不超过一页时视为有界命令。
+    """
+    name = command_parts[0].lower()
+    args = command_parts[1:]
+    if name in ('keys', 'smembers', 'hgetall'):
+        return len(args) == 1
+    if name in RANGED_COMMANDS:
+        ranged = _ranged_args(args)
+        if ranged is None:
+            return False
+        start, stop = ranged[0], ranged[1]
+        return start < 0 or stop < 0 or stop - start >= page_size
+    return False
+
+
+def cursor_reply(client, command_parts, page_size=SCAN_PAGE_SIZE):
+    """对 needs_cursor 判定为无界的命令改用游标/分段读取，返回 CursorReply；其他命令返回 None。
+
+    KEYS 改为 SCAN，HGETALL/SMEMBERS 改为 HSCAN/SSCAN，下标为负或跨度超过一页的 LRANGE
+    与不带额外选项的 ZRANGE 按下标分段读取。分页读取不是原子快照，读取期间的写入可能体现在结果中。
+    """
+    # 有界命令原样执行，保持单次往返与原子性
+    if not needs_cursor(command_parts, page_size):
+        return None
+    name = command_parts[0].lower()
+    args = command_parts[1:]
+
+    if name == 'keys' and len(args) == 1:
+        return CursorReply('list', client.scan_iter(match=args[0], count=page_size))
+    if name == 'smembers' and len(args) == 1:
+        return CursorReply('list', client.sscan_iter(args[0], count=page_size))
+    if name == 'hgetall' and len(args) == 1:
+        return CursorReply('dict', client.hscan_iter(args[0], count=page_size))
+
+    if name in RANGED_COMMANDS:
+        start, stop, extra = _ranged_args(args)
+        command, length_method = RANGED_COMMANDS[name]
+        length = getattr(client, length_method)(args[0])
+        return CursorReply('list', _iter_ranged(client, command, args[0], start, stop, length, extra, page_size))
+    return None
@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+
+
+class TopologySnapshot:
+    """某一时刻Sentinel拓扑的只读快照。"""
+
+    # 新增/移除master等无法就地修补的事件，需要完整重新发现
+    REFRESH_CHANNELS = ('+monitor', '-monitor', '+reset-master')
+
+    def __init__(self, masters, slaves, built_at=None):
+        self.masters = masters
+        self.slaves = slaves
+        self.built_at = built_at if built_at is not None else time.time()
+        self.master_names = sorted(masters)
+        self.nodes = self._build_nodes()
+        # (host, port, master_name) 集合，供终端白名单校验 O(1) 查询
+        self.node_index = frozenset(
+            (str(node['host']), int(node['port']), str(node['master_name']))
+            for node in self.nodes
+        )
+
+    def _build_nodes(self):
+        nodes = []
+        for master_name in self.master_names:
+            master_info = self.masters[master_name]
+            host = master_info.get('ip')
+            port = master_info.get('port')
+            if host and port:
+                nodes.append({
+                    'host': host,
+                    'port': port,
+                    'master_name': master_name,
+                    'node_role': 'master',
+                })
+
+        for master_name in self.master_names:
+            for slave in self.slaves.get(master_name, []):
+                host = slave.get('ip')
+                port = slave.get('port')
+                if host and port:
+                    nodes.append({
+                        'host': host,
+                        'port': port,
+                        'master_name': master_name,
+                        'node_role': 'slave',
+                    })
+        return nodes
+
+    def is_fresh(self, ttl, now=None):
+        now = now if now is not None else time.time()
+        return now - self.built_at < ttl
+
+    def _copy(self):
+        masters = {name: dict(info) for name, info in self.masters.items()}
+        slaves = {name: [dict(slave) for slave in items] for name, items in self.slaves.items()}
+        return masters, slaves
+
+    @staticmethod
+    def _same_address(info, ip, port):
+        return str(info.get('ip')) == str(ip) and str(info.get('port')) == str(port)
+
+    def apply_event(self, channel, data):
+        """按Sentinel事件生成修补后的新快照；无法就地修补时返回 None。"""
+        parts = str(data).split()
+        if channel in self.REFRESH_CHANNELS:
+            return None
+        if channel == '+switch-master':
+            if len(parts) < 5:
+                return None
+            master_name, new_ip, new_port = parts[0], parts[3], parts[4]
+            if master_name not in self.masters:
+                return None
+            masters, slaves = self._copy()
+            masters[master_name].update({'ip': new_ip, 'port': int(new_port), 'is_sdown': False, 'is_odown': False})
+            slaves[master_name] = [
+                slave for slave in slaves.get(master_name, [])
+                if not self._same_address(slave, new_ip, new_port)
+            ]
+            return TopologySnapshot(masters, slaves, built_at=self.built_at)
+
+        if channel not in ('+sdown', '-sdown', '+odown', '-odown', '+slave') or len(parts) < 4:
+            return self
+
+        instance_type, ip, port = parts[0], parts[2], parts[3]
+        if instance_type == 'master':
+            master_name = parts[1]
+            if master_name not in self.masters:
+                return None
+            masters, slaves = self._copy()
+            flag = 'is_sdown' if channel.endswith('sdown') else 'is_odown'
+            masters[master_name][flag] = channel.startswith('+')
+            return TopologySnapshot(masters, slaves, built_at=self.built_at)
+
+        if instance_type != 'slave' or len(parts) < 6 or channel.endswith('odown'):
+            return self
+
+        master_name = parts[5]
+        if master_name not in self.masters:
+            return None
+        masters, slaves = self._copy()
+        remaining = [
+            slave for slave in slaves.get(master_name, [])
+            if not self._same_address(slave, ip, port)
+        ]
+        if channel in ('-sdown', '+slave'):
+            remaining.append({'ip': ip, 'port': int(port), 'flags': 'slave', 'is_disconnected': False})
+        slaves[master_name] = remaining
+        return TopologySnapshot(masters, slaves, built_at=self.built_at)
+
+
+class TopologyEventListener:
+    """在单条连接上订阅Sentinel事件频道，把事件交给回调修补拓扑缓存。"""
+
+    CHANNELS = ('+switch-master', '+sdown', '-sdown', '+odown', '-odown', '+slave', '+monitor', '-monitor', '+reset-master')
+
+    def __init__(self, sentinel_name, sentinel_hosts, client_factory, on_event, on_connect=None, retry_interval=5):
+        self.sentinel_name = sentinel_name
+        self.sentinel_hosts = list(sentinel_hosts)
+        self.client_factory = client_factory
+        self.on_event = on_event
+        self.on_connect = on_connect
+        self.retry_interval = retry_interval
+        self.connected = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None or not self.sentinel_hosts:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"kvdb-sentinel-events-{self.sentinel_name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        attempt = 0
+        while not self._stop_event.is_set():
+            sentinel = self.sentinel_hosts[attempt % len(self.sentinel_hosts)]
+            attempt += 1
+            try:
+                self._listen(sentinel['host'], sentinel['port'])
+            except Exception as exc:
+                logging.warning(
+                    "哨兵组 %s 订阅Sentinel %s:%s 事件失败: %s",
+                    self.sentinel_name,
+                    sentinel['host'],
+                    sentinel['port'],
+                    exc,
+                )
+            finally:
+                self.connected = False
+            self._stop_event.wait(self.retry_interval)
+
+    def _listen(self, host, port):
+        client = self.client_factory(host, port)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(*self.CHANNELS)
+            self.connected = True
+            logging.info("哨兵组 %s 已订阅Sentinel %s:%s 的拓扑事件", self.sentinel_name, host, port)
+            # 订阅建立前可能错过事件，重新同步一次
+            if self.on_connect is not None:
+                self.on_connect()
+            while not self._stop_event.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get('type') == 'message':
+                    self.on_event(message['channel'], message['data'])
+        finally:
+            pubsub.close()
+            client.close()
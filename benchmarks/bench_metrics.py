@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""指标渲染基准：python benchmarks/bench_metrics.py [节点数] [每节点命令数] [轮数]
+
+legacy 为改造前每次抓取新建 CollectorRegistry、逐个 Gauge.labels().set() 的渲染方式，作为对照基线。
+"""
+
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prometheus_client import CollectorRegistry, Gauge, generate_latest  # noqa: E402
+
+from app.metrics import FORMAT_MEDIA_TYPES, FORMAT_TEXT, RedisMetricsCollector  # noqa: E402
+
+BASE_LABELS = ['db_instance', 'db_instance_ip', 'group_name', 'role', 'sentinel_name']
+# 旧实现中直接取自 INFO 字段的指标：(指标名, INFO 字段)
+LEGACY_FIELDS = (
+    ('kvdb_uptime_in_seconds', 'uptime_in_seconds'),
+    ('kvdb_connected_clients', 'connected_clients'),
+    ('kvdb_max_clients', 'maxclients'),
+    ('kvdb_blocked_clients', 'blocked_clients'),
+    ('kvdb_memory_used_bytes', 'used_memory'),
+    ('kvdb_memory_rss_bytes', 'used_memory_rss'),
+    ('kvdb_memory_max_bytes', 'maxmemory'),
+    ('kvdb_commands_processed', 'total_commands_processed'),
+    ('kvdb_commands_processed_total', 'total_commands_processed'),
+    ('kvdb_net_input_bytes', 'total_net_input_bytes'),
+    ('kvdb_net_input_bytes_total', 'total_net_input_bytes'),
+    ('kvdb_net_output_bytes', 'total_net_output_bytes'),
+    ('kvdb_net_output_bytes_total', 'total_net_output_bytes'),
+    ('kvdb_net_input_kbps', 'instantaneous_input_kbps'),
+    ('kvdb_net_output_kbps', 'instantaneous_output_kbps'),
+    ('kvdb_evicted_keys', 'evicted_keys'),
+    ('kvdb_evicted_keys_total', 'evicted_keys'),
+    ('kvdb_connected_slaves', 'connected_slaves'),
+    ('kvdb_master_repl_offset', 'master_repl_offset'),
+    ('kvdb_instantaneous_ops_per_sec', 'instantaneous_ops_per_sec'),
+    ('kvdb_port', 'tcp_port'),
+)
+
+
+def build_redis_info(node_count, command_count):
+    redis_info = {}
+    for index in range(node_count):
+        instance = f"10.0.{index // 250}.{index % 250}:6379"
+        redis_info[instance] = {
+            'up': 1,
+            'master_name': f"group-{index // 3}",
+            'node_role': 'master' if index % 3 == 0 else 'slave',
+            'type': 1,
+            'redis_version': '7.2.4',
+            'uptime_in_seconds': 86400,
+            'connected_clients': 20,
+            'maxclients': 10000,
+            'blocked_clients': 0,
+            'used_memory': 1024 * 1024,
+            'used_memory_rss': 2048 * 1024,
+            'maxmemory': 0,
+            'total_commands_processed': 123456,
+            'total_net_input_bytes': 654321,
+            'total_net_output_bytes': 765432,
+            'instantaneous_input_kbps': 1.5,
+            'instantaneous_output_kbps': 2.5,
+            'evicted_keys': 0,
+            'connected_slaves': 2,
+            'master_repl_offset': 99999,
+            'instantaneous_ops_per_sec': 42,
+            'tcp_port': 6379,
+            'db0': {'keys': 1000, 'expires': 10},
+            'db1': {'keys': 100, 'expires': 1},
+            'commandstats': {
+                f"cmdstat_cmd{command}": {'calls': command * 10, 'usec': command * 100}
+                for command in range(command_count)
+            },
+        }
+    return redis_info
+
+
+def render_legacy(redis_info, sentinel_name):
+    """改造前的渲染路径：每次新建注册表和 Gauge，逐个序列调用 labels(**labels).set()。"""
+    registry = CollectorRegistry()
+    Gauge('kvdb_scrape_success', '', ['sentinel_name'], registry=registry).labels(sentinel_name=sentinel_name).set(1)
+    Gauge('kvdb_scrape_duration_seconds', '', ['sentinel_name'], registry=registry).labels(
+        sentinel_name=sentinel_name).set(1.0)
+    up = Gauge('kvdb_up', '', BASE_LABELS, registry=registry)
+    node_role = Gauge('kvdb_role', '', BASE_LABELS, registry=registry)
+    engine_type = Gauge('kvdb_engine_type', '', BASE_LABELS, registry=registry)
+    fields = [(Gauge(name, '', BASE_LABELS, registry=registry), field) for name, field in LEGACY_FIELDS]
+    db_keys = Gauge('kvdb_db_keys', '', BASE_LABELS + ['db'], registry=registry)
+    db_keys_expiring = Gauge('kvdb_db_keys_expiring', '', BASE_LABELS + ['db'], registry=registry)
+    commands = Gauge('kvdb_commands', '', BASE_LABELS + ['command'], registry=registry)
+    commands_total = Gauge('kvdb_commands_total', '', BASE_LABELS + ['command'], registry=registry)
+    version = Gauge('kvdb_version', '', BASE_LABELS, registry=registry)
+    build_info = Gauge('kvdb_build_info', '', BASE_LABELS + ['engine', 'version'], registry=registry)
+
+    for instance, info in redis_info.items():
+        labels = {
+            'db_instance': instance,
+            'db_instance_ip': instance.rsplit(':', 1)[0],
+            'group_name': info.get('master_name', 'unknown'),
+            'role': info.get('node_role', 'unknown'),
+            'sentinel_name': sentinel_name,
+        }
+        up.labels(**labels).set(info.get('up', 1))
+        node_role.labels(**labels).set(1 if labels['role'] == 'master' else 0)
+        engine_type.labels(**labels).set(info.get('type', 1))
+        for gauge, field in fields:
+            if field in info:
+                gauge.labels(**labels).set(info[field])
+        for key, value in info.items():
+            if key.startswith('db') and isinstance(value, dict):
+                db_keys.labels(**labels, db=key).set(value['keys'])
+                db_keys_expiring.labels(**labels, db=key).set(value['expires'])
+        for cmd, stats in info.get('commandstats', {}).items():
+            cmd_name = cmd.replace('cmdstat_', '')
+            commands.labels(**labels, command=cmd_name).set(stats['calls'])
+            commands_total.labels(**labels, command=cmd_name).set(stats['calls'])
+        version_str = info.get('redis_version', 'unknown')
+        version.labels(**labels).set(int(''.join(ch for ch in version_str if ch.isdigit()) or 0))
+        build_info.labels(**labels, engine='redis', version=version_str).set(1)
+    return generate_latest(registry)
+
+
+def render_current(redis_info, sentinel_name, fmt):
+    collector = RedisMetricsCollector()
+    collector.collect_scrape_metrics(sentinel_name, True, 1.0, [])
+    collector.collect_metrics(redis_info, sentinel_name)
+    return collector.get_metrics(fmt=fmt)
+
+
+def bench(render, rounds):
+    best = None
+    body = b''
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        body = render()
+        elapsed = time.perf_counter() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(body), len(gzip.compress(body, compresslevel=6))
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    command_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    redis_info = build_redis_info(node_count, command_count)
+    cases = [('legacy', FORMAT_TEXT, lambda: render_legacy(redis_info, 'bench'))]
+    for _, fmt in FORMAT_MEDIA_TYPES:
+        cases.append(('current', fmt, lambda fmt=fmt: render_current(redis_info, 'bench', fmt)))
+
+    for path, fmt, render in cases:
+        elapsed, size, gzip_size = bench(render, rounds)
+        print(
+            f"path={path} format={fmt} nodes={node_count} commands={command_count} render={elapsed * 1000:.1f}ms "
+            f"size={size / 1024:.0f}KiB gzip={gzip_size / 1024:.0f}KiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from app.config import Config
+from app.sentinel import RedisSentinel
+
+
+class FakeAsyncPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def info(self, section=None):
+        self.commands.append(section)
+
+    async def execute(self, raise_on_error=True):
+        await asyncio.sleep(self.client.delay)
+        self.client.round_trips += 1
+        return [
+            {"redis_version": "7.2.4", "connected_clients": 3} if section is None else {"cmdstat_get": {"calls": 5}}
+            for section in self.commands
+        ]
+
+
+class FakeAsyncRedis:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self)
+
+
+class AsyncCollectionEngineTest(unittest.TestCase):
+    def setUp(self):
+        Config._config = Config._validate_config({
+            "sentinels": {"prod": {"sentinel_hosts": []}},
+            "metrics": {"collection_engine": "asyncio", "node_deadline": 0.2},
+        })
+        self.sentinel = RedisSentinel("prod")
+
+    def tearDown(self):
+        self.sentinel.close()
+        Config._config = None
+        Config._config_path = None
+
+    def test_fans_out_and_returns_collector_result_shape(self):
+        clients = {6379: FakeAsyncRedis(), 6380: FakeAsyncRedis(delay=1)}
+        self.sentinel._async_engine.get_client = lambda host, port, master_name: clients[port]
+        self.sentinel._discover_nodes = lambda: [
+            {"host": "127.0.0.1", "port": 6379, "master_name": "mymaster", "node_role": "master"},
+            {"host": "127.0.0.1", "port": 6380, "master_name": "mymaster", "node_role": "slave"},
+        ]
+
+        results = self.sentinel.collect_all_redis_info()
+
+        master = results["127.0.0.1:6379"]
+        self.assertEqual(master["up"], 1)
+        self.assertEqual(master["connected_clients"], 3)
+        self.assertEqual(master["commandstats"], {"cmdstat_get": {"calls": 5}})
+        self.assertEqual(clients[6379].round_trips, 1)
+        self.assertEqual(results["127.0.0.1:6380"]["up"], 0)
+        self.assertEqual(results["127.0.0.1:6380"]["error"], "node deadline exceeded")
+        self.assertFalse(self.sentinel.last_scrape_success)
+
+
+if __name__ == "__main__":
+    unittest.main()
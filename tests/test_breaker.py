@@ -0,0 +1,42 @@
+import unittest
+
+from app.breaker import BREAKER_HALF_OPEN, BREAKER_OPEN, CircuitBreaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold_and_allows_single_half_open_probe(self):
+        breaker = CircuitBreaker(threshold=2, backoff=10, max_backoff=60)
+
+        breaker.record_failure("10.0.0.1", 6379, now=0)
+        self.assertTrue(breaker.allow("10.0.0.1", 6379, now=1))
+        breaker.record_failure("10.0.0.1", 6379, now=1)
+
+        self.assertFalse(breaker.allow("10.0.0.1", 6379, now=5))
+        self.assertEqual(breaker.stats(now=5)[0]["state"], BREAKER_OPEN)
+        self.assertTrue(breaker.allow("10.0.0.1", 6379, now=11))
+        self.assertEqual(breaker.stats(now=11)[0]["state"], BREAKER_HALF_OPEN)
+        self.assertFalse(breaker.allow("10.0.0.1", 6379, now=11))
+
+    def test_failed_probe_doubles_backoff_and_success_closes(self):
+        breaker = CircuitBreaker(threshold=1, backoff=10, max_backoff=15)
+
+        breaker.record_failure("10.0.0.1", 6379, now=0)
+        self.assertTrue(breaker.allow("10.0.0.1", 6379, now=10))
+        breaker.record_failure("10.0.0.1", 6379, now=10)
+        self.assertEqual(breaker.stats(now=10)[0]["retry_in"], 15)
+
+        self.assertTrue(breaker.allow("10.0.0.1", 6379, now=25))
+        breaker.record_success("10.0.0.1", 6379)
+        self.assertEqual(breaker.stats(), [])
+        self.assertTrue(breaker.allow("10.0.0.1", 6379))
+
+    def test_zero_threshold_disables_breaker(self):
+        breaker = CircuitBreaker(threshold=0)
+        for _ in range(5):
+            breaker.record_failure("10.0.0.1", 6379)
+        self.assertTrue(breaker.allow("10.0.0.1", 6379))
+        self.assertEqual(breaker.stats(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
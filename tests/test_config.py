@@ -11,6 +11,9 @@ class ConfigTest(unittest.TestCase):
         Config._config = None
         Config._config_path = None
         os.environ.pop("REDIS_PASSWORD", None)
+        os.environ.pop("SHARD_INDEX", None)
+        os.environ.pop("SHARD_COUNT", None)
+        os.environ.pop("SHARED_SNAPSHOT_DIR", None)
 
     def test_config_parses_hosts_and_env_password(self):
         os.environ["REDIS_PASSWORD"] = "secret"
@@ -62,6 +65,23 @@ sentinels:
             with self.assertRaises(ConfigError):
                 Config.load_config(str(config_file), force_reload=True)
 
+    def test_shard_settings_can_come_from_env(self):
+        os.environ["SHARD_INDEX"] = "2"
+        os.environ["SHARD_COUNT"] = "3"
+        metrics = Config._validate_config({"metrics": {"shard_index": 0, "shard_count": 1}})["metrics"]
+        self.assertEqual((metrics["shard_index"], metrics["shard_count"]), (2, 3))
+
+        os.environ["SHARD_INDEX"] = "3"
+        with self.assertRaises(ConfigError):
+            Config._validate_config({})
+
+    def test_shared_snapshot_dir_can_come_from_env(self):
+        self.assertEqual(Config._validate_config({})["metrics"]["shared_snapshot_dir"], "")
+
+        os.environ["SHARED_SNAPSHOT_DIR"] = "/tmp/kvdb-snapshots"
+        metrics = Config._validate_config({"metrics": {"shared_snapshot_dir": ""}})["metrics"]
+        self.assertEqual(metrics["shared_snapshot_dir"], "/tmp/kvdb-snapshots")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,36 @@
+import threading
+import unittest
+
+from app.executor import SharedExecutor
+
+
+class SharedExecutorTest(unittest.TestCase):
+    def test_group_limit_queues_without_blocking_other_groups(self):
+        executor = SharedExecutor(max_workers=4)
+        release = threading.Event()
+        try:
+            blocked = [executor.submit("a", 1, release.wait, 5) for _ in range(3)]
+            other = executor.submit("b", 1, lambda: "done")
+
+            self.assertEqual(other.result(timeout=2), "done")
+            stats = executor.stats()
+            self.assertEqual(stats["groups"]["a"], {"limit": 1, "running": 1, "queued": 2})
+
+            release.set()
+            self.assertTrue(all(future.result(timeout=2) for future in blocked))
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_exceptions_are_propagated_to_future(self):
+        executor = SharedExecutor(max_workers=1)
+        try:
+            future = executor.submit("a", 1, int, "not-a-number")
+            with self.assertRaises(ValueError):
+                future.result(timeout=2)
+        finally:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
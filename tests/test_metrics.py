@@ -53,6 +53,53 @@ class MetricsTest(unittest.TestCase):
         self.assertIn('kvdb_build_info{db_instance="127.0.0.1:6379",db_instance_ip="127.0.0.1",engine="redis",group_name="mymaster",role="master",sentinel_name="prod",version="7.2.4"} 1.0', metrics_text)
         self.assertIn("kvdb_commands_processed_total", metrics_text)
 
+    def test_series_timestamps_skip_live_families(self):
+        if RedisMetricsCollector is None:
+            self.skipTest(f"missing dependency: {IMPORT_ERROR}")
+
+        collector = RedisMetricsCollector()
+        collector.collect_snapshot_metrics("prod", 3.0)
+        collector.collect_metrics(
+            {"127.0.0.1:6379": {"up": 1, "master_name": "mymaster", "node_role": "master", "type": 1}},
+            "prod",
+        )
+
+        metrics_text = collector.get_metrics(timestamp=1700000000.0).decode()
+
+        self.assertIn('kvdb_snapshot_age_seconds{sentinel_name="prod"} 3.0\n', metrics_text)
+        self.assertIn('role="master",sentinel_name="prod"} 1.0 1700000000000\n', metrics_text)
+
+    def test_family_selection_drops_legacy_and_excluded_families(self):
+        if RedisMetricsCollector is None:
+            self.skipTest(f"missing dependency: {IMPORT_ERROR}")
+
+        families = RedisMetricsCollector.select_families(exclude=["kvdb_db_keys"], legacy_total_gauges=False)
+        collector = RedisMetricsCollector(families)
+        collector.collect_metrics(
+            {
+                "127.0.0.1:6379": {
+                    "up": 1,
+                    "master_name": "mymaster",
+                    "node_role": "master",
+                    "type": 1,
+                    "total_commands_processed": 10,
+                    "db0": {"keys": 3, "expires": 1},
+                    "commandstats": {"cmdstat_get": {"calls": 5}},
+                }
+            },
+            "prod",
+        )
+
+        metrics_text = collector.get_metrics().decode()
+
+        self.assertIn("kvdb_commands_processed{", metrics_text)
+        self.assertIn('command="get"', metrics_text)
+        self.assertIn("kvdb_db_keys_expiring{", metrics_text)
+        self.assertNotIn("kvdb_commands_total", metrics_text)
+        self.assertNotIn("kvdb_commands_processed_total", metrics_text)
+        self.assertNotIn("kvdb_db_keys{", metrics_text)
+        self.assertNotIn("# HELP kvdb_db_keys ", metrics_text)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from app.pool import ConnectionPoolRegistry
+
+
+class ConnectionPoolRegistryTest(unittest.TestCase):
+    def test_pools_are_reused_per_host_port_and_password(self):
+        registry = ConnectionPoolRegistry()
+
+        first = registry.get_pool("127.0.0.1", 6379, "secret")
+        second = registry.get_pool("127.0.0.1", "6379", "secret")
+        other_password = registry.get_pool("127.0.0.1", 6379, "other")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_password)
+        self.assertIs(registry.get_client("127.0.0.1", 6379, "secret").connection_pool, first)
+
+    def test_retain_evicts_vanished_nodes_and_reaps_idle_pools(self):
+        registry = ConnectionPoolRegistry(idle_timeout=60)
+        registry.get_pool("127.0.0.1", 6379)
+        registry.get_pool("127.0.0.2", 6379)
+
+        self.assertEqual(registry.retain([("127.0.0.1", 6379)]), 1)
+        self.assertEqual([(s["host"], s["port"]) for s in registry.stats()], [("127.0.0.1", 6379)])
+
+        self.assertEqual(registry.reap_idle(now=registry._last_used[("127.0.0.1", 6379, "")] + 61), 1)
+        self.assertEqual(registry.stats(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app.config import Config
+from app.registry import SentinelRegistry
+
+
+class FakeSentinel:
+    def __init__(self, sentinel_name):
+        self.sentinel_name = sentinel_name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class SentinelRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = Path(self.temp_dir.name) / "config.yaml"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        Config._config = None
+        Config._config_path = None
+
+    def write_config(self, prod_host):
+        self.config_file.write_text(
+            "sentinels:\n"
+            f"  prod:\n    sentinel_hosts: ['{prod_host}:26379']\n"
+            "  test:\n    sentinel_hosts: ['10.0.0.9:26379']\n",
+            encoding="utf-8",
+        )
+        Config.load_config(str(self.config_file), force_reload=True)
+
+    def test_concurrent_first_access_creates_one_client(self):
+        self.write_config("10.0.0.1")
+        created = []
+
+        def factory(sentinel_name):
+            time.sleep(0.05)
+            created.append(sentinel_name)
+            return FakeSentinel(sentinel_name)
+
+        registry = SentinelRegistry(factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("prod"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(created, ["prod"])
+        self.assertTrue(all(result is results[0] for result in results))
+        with self.assertRaises(KeyError):
+            registry.get("missing")
+
+    def test_reload_rebuilds_only_changed_groups(self):
+        self.write_config("10.0.0.1")
+        discarded = []
+        registry = SentinelRegistry(FakeSentinel, on_discard=discarded.append)
+        prod, test = registry.get("prod"), registry.get("test")
+
+        self.write_config("10.0.0.2")
+
+        self.assertIsNot(registry.get("prod"), prod)
+        self.assertIs(registry.get("test"), test)
+        self.assertTrue(prod.closed)
+        self.assertEqual(discarded, ["prod"])
+
+
+if __name__ == "__main__":
+    unittest.main()
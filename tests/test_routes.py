@@ -1,3 +1,4 @@
+import gzip
 import tempfile
 import unittest
 import importlib.util
@@ -7,6 +8,26 @@ from app import create_app
 from app.config import Config
 
 
+class FakeSentinel:
+    sentinel_status = [{"host": "127.0.0.1", "port": 26379, "up": 1, "error": ""}]
+    last_scrape_success = True
+    last_scrape_duration = 0.1
+    last_scrape_error = ""
+    last_owned_nodes = 1
+
+    def __init__(self, sentinel_name="prod"):
+        self.sentinel_name = sentinel_name
+
+    def collect_all_redis_info(self, deadline=None):
+        return {"127.0.0.1:6379": {"up": 1, "master_name": "mymaster", "node_role": "master"}}
+
+    def pool_stats(self):
+        return []
+
+    def breaker_stats(self):
+        return []
+
+
 class RoutesTest(unittest.TestCase):
     def tearDown(self):
         Config._config = None
@@ -29,6 +50,267 @@ class RoutesTest(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("Sentinel", response.get_json()["error"])
 
+    def test_metrics_support_gzip_and_conditional_requests(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        from app import routes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                "sentinels:\n  prod:\n    sentinel_hosts: []\nmetrics:\n  collect_interval: 60\n",
+                encoding="utf-8",
+            )
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            routes._registry.register("prod", FakeSentinel())
+            try:
+                plain = client.get("/prod/metrics")
+                compressed = client.get("/prod/metrics", headers={"Accept-Encoding": "gzip"})
+                etag = plain.headers["ETag"]
+                not_modified = client.get("/prod/metrics", headers={"If-None-Match": etag})
+            finally:
+                routes._scheduler.stop()
+                routes._registry._entries.pop("prod", None)
+
+        self.assertEqual(plain.status_code, 200)
+        self.assertIn(b'kvdb_up{db_instance="127.0.0.1:6379"', plain.data)
+        self.assertIn(b"kvdb_snapshot_age_seconds", plain.data)
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertIn(b"kvdb_snapshot_age_seconds", gzip.decompress(compressed.data))
+        self.assertEqual(compressed.headers["ETag"], etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_metrics_negotiate_openmetrics(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        from app import routes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                "sentinels:\n  prod:\n    sentinel_hosts: []\nmetrics:\n  collect_interval: 60\n",
+                encoding="utf-8",
+            )
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            routes._registry.register("prod", FakeSentinel())
+            accept = "application/openmetrics-text;version=1.0.0,text/plain;version=0.0.4;q=0.5,*/*;q=0.1"
+            try:
+                openmetrics = client.get("/prod/metrics", headers={"Accept": accept})
+                text = client.get("/prod/metrics", headers={"Accept": "*/*"})
+            finally:
+                routes._scheduler.stop()
+                routes._registry._entries.pop("prod", None)
+
+        self.assertTrue(openmetrics.content_type.startswith("application/openmetrics-text"))
+        self.assertEqual(openmetrics.data.count(b"# EOF"), 1)
+        self.assertTrue(openmetrics.data.endswith(b"# EOF\n"))
+        self.assertIn(b"kvdb_snapshot_age_seconds", openmetrics.data)
+        self.assertTrue(text.content_type.startswith("text/plain"))
+        self.assertNotIn(b"# EOF", text.data)
+        self.assertNotEqual(openmetrics.headers["ETag"], text.headers["ETag"])
+
+    def test_aggregate_metrics_cover_all_groups_and_filter(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        from app import routes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                "sentinels:\n  prod:\n    sentinel_hosts: []\n  test:\n    sentinel_hosts: []\n"
+                "metrics:\n  collect_interval: 0\n",
+                encoding="utf-8",
+            )
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            routes._registry.register("prod", FakeSentinel("prod"))
+            routes._registry.register("test", FakeSentinel("test"))
+            try:
+                everything = client.get("/metrics")
+                filtered = client.get("/metrics?group=test")
+                unknown = client.get("/metrics?group=missing")
+            finally:
+                routes._registry._entries.pop("prod", None)
+                routes._registry._entries.pop("test", None)
+
+        self.assertEqual(everything.status_code, 200)
+        self.assertIn(b'kvdb_scrape_success{sentinel_name="prod"} 1.0', everything.data)
+        self.assertIn(b'kvdb_scrape_success{sentinel_name="test"} 1.0', everything.data)
+        self.assertEqual(everything.data.count(b"# TYPE kvdb_up gauge"), 1)
+        # 实时采集复用模块级的有界线程池，不再每次请求新建
+        self.assertIsNotNone(routes._aggregate_pool)
+        self.assertEqual(routes._aggregate_pool._max_workers, routes.AGGREGATE_MAX_WORKERS)
+        self.assertIn(b'sentinel_name="test"', filtered.data)
+        self.assertNotIn(b'sentinel_name="prod"', filtered.data)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_info_stream_sends_full_state_then_changed_fields(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        from app import routes
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                "sentinels:\n  prod:\n    sentinel_hosts: []\nmetrics:\n  collect_interval: 60\n"
+                "web_ui:\n  max_streams: 1\n",
+                encoding="utf-8",
+            )
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            routes._registry.register("prod", FakeSentinel())
+            try:
+                response = client.get("/prod/info/stream", buffered=False)
+                events = iter(response.response)
+                retry = next(events)
+                first = next(events)
+                rejected = client.get("/prod/info/stream", buffered=False)
+                response.close()
+                reopened = client.get("/prod/info/stream", buffered=False)
+                reopened.close()
+            finally:
+                routes._scheduler.stop()
+                routes._registry._entries.pop("prod", None)
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertEqual(rejected.status_code, 503)
+        self.assertEqual(reopened.status_code, 200)
+        self.assertEqual(routes._active_streams, 0)
+        self.assertTrue(retry.startswith(b"retry: "))
+        self.assertTrue(first.startswith(b"event: full\n"))
+        self.assertIn(b'"host":', first)
+
+        previous = {"a:1": {"role": "master", "master_name": "m", "connected_clients": 1, "used_memory": 10}}
+        current = {"a:1": {"role": "master", "master_name": "m", "connected_clients": 2, "used_memory": 10}}
+        self.assertEqual(routes.diff_node_fields(previous, current), ({"a:1": {"connected_clients": 2}}, False))
+        self.assertEqual(routes.diff_node_fields(previous, {})[1], True)
+        failover = {"a:1": {**current["a:1"], "role": "slave"}}
+        self.assertEqual(routes.diff_node_fields(previous, failover)[1], True)
+
+    def test_info_data_compact_format_pages_and_sorts(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        from app import routes
+
+        class ClusterSentinel(FakeSentinel):
+            def collect_all_redis_info(self, deadline=None):
+                return {
+                    f"10.0.0.{i}:6379": {
+                        "host": f"10.0.0.{i}", "port": 6379, "up": 1, "master_name": f"mymaster-{i // 2}",
+                        "node_role": "master" if i % 2 == 0 else "slave", "connected_clients": i,
+                    }
+                    for i in range(6)
+                }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                "sentinels:\n  prod:\n    sentinel_hosts: []\nmetrics:\n  collect_interval: 0\n",
+                encoding="utf-8",
+            )
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            routes._registry.register("prod", ClusterSentinel())
+            try:
+                page = client.get("/prod/info/data?format=compact&offset=1&limit=2").get_json()
+                by_clients = client.get("/prod/info/data?format=compact&sort=-connected_clients&limit=1").get_json()
+                filtered = client.get("/prod/info/data?format=compact&filter=mymaster-2").get_json()
+                invalid = client.get("/prod/info/data?format=compact&sort=password")
+            finally:
+                routes._scheduler.discard("prod")
+                routes._registry._entries.pop("prod", None)
+
+        host = page["fields"].index("host")
+        self.assertEqual(page["total"], 6)
+        self.assertEqual([row[host] for row in page["rows"]], ["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(by_clients["rows"][0][host], "10.0.0.5")
+        self.assertEqual(filtered["total"], 2)
+        self.assertEqual(invalid.status_code, 400)
+
+        timed_out = routes.build_node_data({"host": "10.0.0.9", "port": 6379, "timed_out": True,
+                                            "error": "scrape deadline exceeded"})
+        self.assertIsNone(timed_out["up"])
+        self.assertTrue(timed_out["timed_out"])
+        self.assertIn("timed_out", page["fields"])
+
+    def test_terminal_batch_runs_commands_in_one_pipeline(self):
+        if importlib.util.find_spec("flask") is None:
+            self.skipTest("missing dependency: flask")
+        import redis
+        from app import routes
+        from app.terminal import CursorReply
+
+        class TerminalSentinel(FakeSentinel):
+            pipelines = []
+
+            def is_known_node(self, host, port, master_name):
+                return (host, port, master_name) == ("127.0.0.1", 6379, "mymaster")
+
+            def execute_redis_pipeline(self, host, port, master_name, commands, transaction=False):
+                self.pipelines.append((commands, transaction))
+                if commands[0][0] == "BADCMD":
+                    raise redis.exceptions.ExecAbortError("EXECABORT Transaction discarded because of previous errors.")
+                return ["v1", ValueError("WRONGTYPE Operation against a key")]
+
+            def execute_redis_command(self, host, port, master_name, command_parts):
+                if command_parts[0] == "KEYS":
+                    return CursorReply("list", iter(["k1", "k2"]))
+                return "v1"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text("sentinels:\n  prod:\n    sentinel_hosts: []\n", encoding="utf-8")
+            Config.load_config(str(config_file), force_reload=True)
+
+            app = create_app({"TESTING": True})
+            client = app.test_client()
+            sentinel = TerminalSentinel()
+            routes._registry.register("prod", sentinel)
+            target = {"host": "127.0.0.1", "port": 6379, "master_name": "mymaster"}
+            try:
+                batch = client.post("/prod/terminal/execute", json={
+                    **target, "commands": ["GET k1", 'LLEN "my key"'], "transaction": True,
+                })
+                blocked = client.post("/prod/terminal/execute", json={**target, "commands": ["GET k1", "FLUSHALL"]})
+                manual_multi = client.post("/prod/terminal/execute", json={**target, "commands": ["MULTI"]})
+                unbounded = client.post("/prod/terminal/execute", json={**target, "commands": ["GET k1", "LRANGE big 0 -1"]})
+                aborted = client.post("/prod/terminal/execute", json={
+                    **target, "commands": ["BADCMD"], "transaction": True,
+                })
+                single = client.post("/prod/terminal/execute", json={**target, "command": "GET k1", "stream": True})
+                paged = client.post("/prod/terminal/execute", json={**target, "command": "KEYS *", "stream": True})
+            finally:
+                routes._registry._entries.pop("prod", None)
+
+        body = batch.get_json()
+        self.assertEqual(batch.status_code, 200)
+        self.assertEqual(sentinel.pipelines[0], ([["GET", "k1"], ["LLEN", "my key"]], True))
+        self.assertEqual(body["results"][0], {"command": "GET k1", "ok": True, "output": "v1", "truncated": False})
+        self.assertFalse(body["results"][1]["ok"])
+        self.assertIn("WRONGTYPE", body["results"][1]["error"])
+        self.assertEqual(blocked.status_code, 403)
+        self.assertEqual(manual_multi.status_code, 400)
+        self.assertEqual(unbounded.status_code, 400)
+        self.assertEqual(len(sentinel.pipelines), 2)
+        self.assertEqual(aborted.status_code, 400)
+        self.assertIn("EXECABORT", aborted.get_json()["error"])
+        # 只有分页读取的结果才流式返回，普通命令保持有界的JSON响应
+        self.assertEqual(single.get_json()["output"], "v1")
+        self.assertEqual(paged.mimetype, "text/plain")
+        self.assertEqual(paged.get_data(as_text=True), "1) k1\n2) k2")
+
 
 if __name__ == "__main__":
     unittest.main()
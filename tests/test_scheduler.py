@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+
+from app.config import Config
+from app.scheduler import CollectionScheduler
+
+
+class FakeSentinel:
+    def __init__(self, sentinel_name="prod"):
+        self.sentinel_name = sentinel_name
+        self.sentinel_status = [{"host": "127.0.0.1", "port": 26379, "up": 1, "error": ""}]
+        self.last_scrape_success = False
+        self.last_scrape_duration = 0
+        self.last_scrape_error = ""
+        self.last_owned_nodes = 1
+        self.calls = 0
+        self.release = None
+
+    def collect_all_redis_info(self, deadline=None):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        self.last_scrape_success = True
+        self.last_scrape_duration = 0.5
+        return {"127.0.0.1:6379": {"up": 1, "master_name": "mymaster", "node_role": "master"}}
+
+
+class CollectionSchedulerTest(unittest.TestCase):
+    def tearDown(self):
+        Config._config = None
+        Config._config_path = None
+
+    def test_background_mode_serves_cached_snapshot(self):
+        Config._config = Config._validate_config({"metrics": {"collect_interval": 60}})
+        scheduler = CollectionScheduler()
+        sentinel = FakeSentinel()
+        try:
+            first = scheduler.get_snapshot(sentinel)
+            second = scheduler.get_snapshot(sentinel)
+        finally:
+            scheduler.stop()
+
+        self.assertIs(first, second)
+        self.assertEqual(sentinel.calls, 1)
+        self.assertTrue(first.success)
+        self.assertEqual(first.duration, 0.5)
+        self.assertIn("127.0.0.1:6379", first.redis_info)
+
+    def test_zero_interval_collects_on_every_request(self):
+        Config._config = Config._validate_config({"metrics": {"collect_interval": 0}})
+        scheduler = CollectionScheduler()
+        sentinel = FakeSentinel()
+
+        scheduler.get_snapshot(sentinel)
+        scheduler.get_snapshot(sentinel)
+
+        self.assertEqual(sentinel.calls, 2)
+
+    def test_concurrent_collections_are_coalesced(self):
+        Config._config = Config._validate_config({"metrics": {"collect_interval": 0}})
+        scheduler = CollectionScheduler()
+        sentinel = FakeSentinel()
+        sentinel.release = threading.Event()
+        snapshots = []
+
+        threads = [threading.Thread(target=lambda: snapshots.append(scheduler.get_snapshot(sentinel))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while scheduler.coalesced_requests("prod") < 2:
+            time.sleep(0.01)
+        sentinel.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(sentinel.calls, 1)
+        self.assertEqual(len(snapshots), 3)
+        self.assertTrue(all(snapshot is snapshots[0] for snapshot in snapshots))
+
+    def test_collection_finishing_after_discard_is_not_stored(self):
+        Config._config = Config._validate_config({"metrics": {"collect_interval": 60}})
+        scheduler = CollectionScheduler()
+        sentinel = FakeSentinel()
+        sentinel.release = threading.Event()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(scheduler.collect(sentinel)))
+        thread.start()
+        while sentinel.calls == 0:
+            time.sleep(0.01)
+
+        scheduler.discard("prod")
+        sentinel.release.set()
+        thread.join(5)
+
+        self.assertTrue(results[0].success)
+        self.assertNotIn("prod", scheduler._snapshots)
+
+
+if __name__ == "__main__":
+    unittest.main()
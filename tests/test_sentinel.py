@@ -0,0 +1,257 @@
+import threading
+import time
+import unittest
+
+import redis
+
+from app.config import Config
+from app.sentinel import ENGINE_KVROCKS, INFO_MODE_ALL, INFO_MODE_PIPELINE, RedisSentinel
+from app.sentinel_clients import SentinelClientManager
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def info(self, section=None):
+        self.commands.append(('info', section))
+
+    def execute_command(self, *args):
+        self.commands.append(tuple(arg.lower() for arg in args))
+
+    def execute(self, raise_on_error=True):
+        self.client.round_trips += 1
+        return [self.client.reply(command) for command in self.commands]
+
+
+class FakeRedis:
+    def __init__(self, info, command_stats=None, keyspace=None, support_info_all=True):
+        self._info = info
+        self._command_stats = command_stats or {}
+        self._keyspace = keyspace
+        self.support_info_all = support_info_all
+        self.round_trips = 0
+
+    def reply(self, command):
+        if command == ('info', None):
+            return dict(self._info)
+        if command == ('info', 'commandstats'):
+            return dict(self._command_stats)
+        if command == ('info', 'keyspace'):
+            return self._keyspace
+        raise AssertionError(command)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def info(self, section=None):
+        self.round_trips += 1
+        if section == 'all':
+            if not self.support_info_all:
+                raise redis.ResponseError("unknown section")
+            return {**self._info, **self._command_stats, 'errorstat_ERR': {'count': 1}}
+        return self.reply(('info', section))
+
+    def execute_command(self, *args):
+        self.round_trips += 1
+        return self.reply(tuple(arg.lower() for arg in args))
+
+
+class FakeSentinelClient:
+    def __init__(self):
+        self.calls = []
+
+    def sentinel_masters(self):
+        self.calls.append("masters")
+        return {
+            "m1": {"name": "m1", "ip": "10.0.0.1", "port": 6379},
+            "m2": {"name": "m2", "ip": "10.0.0.2", "port": 6379},
+        }
+
+    def sentinel_slaves(self, master_name):
+        self.calls.append(f"slaves:{master_name}")
+        return [
+            {"ip": "10.0.1.1", "port": 6379, "flags": "slave", "is_disconnected": False},
+            {"ip": "10.0.1.2", "port": 6379, "flags": "slave,s_down", "is_disconnected": False},
+        ] if master_name == "m1" else []
+
+
+def make_sentinel(metrics=None):
+    Config._config = Config._validate_config({"sentinels": {"prod": {"sentinel_hosts": []}}, "metrics": metrics or {}})
+    return RedisSentinel("prod")
+
+
+class RedisSentinelCollectTest(unittest.TestCase):
+    def tearDown(self):
+        Config._config = None
+        Config._config_path = None
+
+    def test_redis_node_switches_to_single_info_all_round_trip(self):
+        sentinel = make_sentinel()
+        client = FakeRedis(
+            {"redis_version": "7.2.4", "db0": {"keys": 3, "expires": 0}},
+            {"cmdstat_get": {"calls": 10}},
+        )
+        sentinel.get_redis_client = lambda host, port, master_name: client
+
+        first = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        self.assertEqual(client.round_trips, 1)
+        self.assertEqual(sentinel._node_capabilities[("127.0.0.1", 6379)]["info_mode"], INFO_MODE_ALL)
+
+        second = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        self.assertEqual(client.round_trips, 2)
+        for info in (first, second):
+            self.assertEqual(info["up"], 1)
+            self.assertEqual(info["commandstats"], {"cmdstat_get": {"calls": 10}})
+            self.assertEqual(info["total_keys"], 3)
+        self.assertNotIn("errorstat_ERR", second)
+
+    def test_info_all_failure_falls_back_to_pipeline(self):
+        sentinel = make_sentinel()
+        client = FakeRedis({"redis_version": "2.4.0"}, {"cmdstat_get": {"calls": 1}}, support_info_all=False)
+        sentinel.get_redis_client = lambda host, port, master_name: client
+
+        sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        info = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+
+        self.assertEqual(info["commandstats"], {"cmdstat_get": {"calls": 1}})
+        self.assertEqual(sentinel._node_capabilities[("127.0.0.1", 6379)]["info_mode"], INFO_MODE_PIPELINE)
+
+    def test_kvrocks_keyspace_is_pipelined_after_first_probe(self):
+        sentinel = make_sentinel()
+        client = FakeRedis({"version": "2.8.0", "disk_capacity": 100}, keyspace={"total_keys": 42})
+        sentinel.get_redis_client = lambda host, port, master_name: client
+
+        sentinel.collect_redis_info("127.0.0.1", 6666, "kv", "master")
+        self.assertEqual(client.round_trips, 2)
+
+        info = sentinel.collect_redis_info("127.0.0.1", 6666, "kv", "master")
+        self.assertEqual(client.round_trips, 3)
+        self.assertEqual(info["type"], ENGINE_KVROCKS)
+        self.assertEqual(info["total_keys"], 42)
+
+    def test_disabled_commandstats_uses_plain_info(self):
+        sentinel = make_sentinel({"exclude_sections": ["commandstats"]})
+        client = FakeRedis({"redis_version": "7.2.4"}, {"cmdstat_get": {"calls": 10}})
+        sentinel.get_redis_client = lambda host, port, master_name: client
+
+        sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        info = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+
+        self.assertEqual(client.round_trips, 2)
+        self.assertNotIn("commandstats", info)
+        self.assertEqual(sentinel._node_capabilities[("127.0.0.1", 6379)]["info_mode"], INFO_MODE_PIPELINE)
+
+    def test_slow_sections_are_served_from_cache_until_due(self):
+        sentinel = make_sentinel({"section_intervals": {"commandstats": 60}})
+        client = FakeRedis({"redis_version": "7.2.4"}, {"cmdstat_get": {"calls": 10}})
+        sentinel.get_redis_client = lambda host, port, master_name: client
+        node_key = ("127.0.0.1", 6379)
+
+        sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        client._command_stats = {"cmdstat_get": {"calls": 20}}
+        cached = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        self.assertEqual(cached["commandstats"], {"cmdstat_get": {"calls": 10}})
+        self.assertEqual(client.round_trips, 2)
+
+        fetched_at, command_stats = sentinel._section_cache[node_key]["commandstats"]
+        sentinel._section_cache[node_key]["commandstats"] = (fetched_at - 61, command_stats)
+        refreshed = sentinel.collect_redis_info("127.0.0.1", 6379, "mymaster", "master")
+        self.assertEqual(refreshed["commandstats"], {"cmdstat_get": {"calls": 20}})
+
+    def test_scrape_deadline_returns_partial_results_and_reuses_stragglers(self):
+        sentinel = make_sentinel()
+        nodes = [
+            {"host": "10.0.0.1", "port": 6379, "master_name": "mymaster", "node_role": "master"},
+            {"host": "10.0.0.2", "port": 6379, "master_name": "mymaster", "node_role": "slave"},
+        ]
+        sentinel._discover_nodes = lambda: list(nodes)
+        release = threading.Event()
+        calls = []
+
+        def collect(host, port, master_name, node_role):
+            calls.append(host)
+            if host == "10.0.0.2":
+                release.wait(5)
+            return {"up": 1, "master_name": master_name, "node_role": node_role}
+
+        sentinel.collect_redis_info = collect
+        first = sentinel.collect_all_redis_info(deadline=0.2)
+        self.assertEqual(first["10.0.0.1:6379"]["up"], 1)
+        self.assertTrue(first["10.0.0.2:6379"]["timed_out"])
+        self.assertNotIn("up", first["10.0.0.2:6379"])
+        self.assertTrue(sentinel.last_scrape_success)
+
+        release.set()
+        second = sentinel.collect_all_redis_info(deadline=5)
+        self.assertEqual(second["10.0.0.2:6379"]["up"], 1)
+        self.assertEqual(calls.count("10.0.0.2"), 1)
+
+    def test_half_open_probe_past_deadline_is_recorded_on_next_scrape(self):
+        sentinel = make_sentinel({"breaker_threshold": 1, "breaker_backoff": 0.1})
+        node = {"host": "10.0.0.1", "port": 6379, "master_name": "mymaster", "node_role": "master"}
+        sentinel._discover_nodes = lambda: [dict(node)]
+        release = threading.Event()
+        outcomes = iter([{"up": 0, "error": "down"}, "slow"])
+
+        def collect(host, port, master_name, node_role):
+            outcome = next(outcomes, {"up": 1})
+            if outcome == "slow":
+                release.wait(5)
+                outcome = {"up": 1}
+            return {**outcome, "master_name": master_name, "node_role": node_role}
+
+        sentinel.collect_redis_info = collect
+        sentinel.collect_all_redis_info(deadline=5)
+        time.sleep(0.15)
+        probing = sentinel.collect_all_redis_info(deadline=0.2)
+        self.assertTrue(probing["10.0.0.1:6379"]["timed_out"])
+        self.assertEqual(sentinel.breaker_stats()[0]["state"], 1)
+
+        release.set()
+        recovered = sentinel.collect_all_redis_info(deadline=5)
+        self.assertEqual(recovered["10.0.0.1:6379"]["up"], 1)
+        self.assertEqual(sentinel.breaker_stats(), [])
+
+
+class RedisSentinelTopologyTest(unittest.TestCase):
+    def tearDown(self):
+        Config._config = None
+        Config._config_path = None
+
+    def test_topology_is_built_once_and_shared_by_readers(self):
+        sentinel = make_sentinel()
+        client = FakeSentinelClient()
+        sentinel.sentinel_manager = SentinelClientManager(
+            "prod", [{"host": "127.0.0.1", "port": 26379}], lambda host, port: client
+        )
+
+        nodes = sentinel._discover_nodes()
+        self.assertTrue(sentinel.is_known_node("10.0.1.1", "6379", "m1"))
+        self.assertFalse(sentinel.is_known_node("10.0.1.2", 6379, "m1"))
+        self.assertEqual(set(sentinel.get_all_masters()), {"m1", "m2"})
+
+        self.assertEqual(sorted(client.calls), ["masters", "slaves:m1", "slaves:m2"])
+        self.assertEqual(
+            [(node["host"], node["node_role"]) for node in nodes],
+            [("10.0.0.1", "master"), ("10.0.0.2", "master"), ("10.0.1.1", "slave")],
+        )
+
+    def test_known_node_check_uses_cached_topology(self):
+        sentinel = make_sentinel()
+        client = FakeSentinelClient()
+        sentinel.sentinel_manager = SentinelClientManager(
+            "prod", [{"host": "127.0.0.1", "port": 26379}], lambda host, port: client
+        )
+        sentinel.get_topology()
+        sentinel.invalidate_topology()
+
+        self.assertTrue(sentinel.is_known_node("10.0.0.1", 6379, "m1"))
+        self.assertEqual(len(client.calls), 3)
+        self.assertFalse(sentinel.is_known_node("10.0.0.1", 6379, "m2"))
+        self.assertEqual(len(client.calls), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
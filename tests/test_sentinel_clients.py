@@ -0,0 +1,73 @@
+import unittest
+
+import redis
+
+from app.sentinel_clients import SentinelClientManager
+
+
+class FakeSentinelClient:
+    def __init__(self, name, available=True):
+        self.name = name
+        self.available = available
+        self.calls = 0
+
+    def ping(self):
+        if not self.available:
+            raise redis.ConnectionError(f"{self.name} down")
+        return True
+
+    def sentinel_masters(self):
+        self.calls += 1
+        if not self.available:
+            raise redis.ConnectionError(f"{self.name} down")
+        return {"mymaster": {"ip": "10.0.0.1", "port": 6379}}
+
+
+def make_manager(clients):
+    hosts = [{"host": name, "port": 26379} for name in clients]
+    return SentinelClientManager("prod", hosts, lambda host, port: clients[host])
+
+
+class SentinelClientManagerTest(unittest.TestCase):
+    def test_queries_prefer_lowest_latency_and_skip_failed_sentinels(self):
+        clients = {"slow": FakeSentinelClient("slow"), "fast": FakeSentinelClient("fast")}
+        manager = make_manager(clients)
+        manager.probe()
+        manager._entries[0]["latency"] = 0.5
+        manager._entries[1]["latency"] = 0.001
+
+        manager.query(lambda client: client.sentinel_masters(), "获取master列表")
+        self.assertEqual((clients["slow"].calls, clients["fast"].calls), (0, 1))
+
+        clients["fast"].available = False
+        result = manager.query(lambda client: client.sentinel_masters(), "获取master列表")
+        self.assertIn("mymaster", result)
+        self.assertEqual([status["up"] for status in manager.status()], [1, 0])
+
+    def test_probe_brings_failed_sentinel_back(self):
+        clients = {"s1": FakeSentinelClient("s1", available=False)}
+        manager = make_manager(clients)
+
+        manager.probe()
+        self.assertEqual(manager.status()[0]["up"], 0)
+        self.assertIn("down", manager.status()[0]["error"])
+
+        clients["s1"].available = True
+        manager.probe()
+        self.assertEqual(manager.status()[0]["up"], 1)
+        self.assertEqual(manager.status()[0]["error"], "")
+
+    def test_error_reply_does_not_mark_sentinel_down(self):
+        clients = {"s1": FakeSentinelClient("s1")}
+        manager = make_manager(clients)
+        manager.probe()
+
+        def missing_master(client):
+            raise redis.ResponseError("No such master with that name")
+
+        self.assertIsNone(manager.query(missing_master, "获取从节点信息"))
+        self.assertEqual(manager.status()[0]["up"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
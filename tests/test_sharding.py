@@ -0,0 +1,33 @@
+import unittest
+
+from app.sharding import HashRing
+
+
+def make_nodes(count):
+    return [{"host": f"10.0.0.{index % 250}", "port": 6379 + index // 250} for index in range(count)]
+
+
+class HashRingTest(unittest.TestCase):
+    def test_every_node_is_owned_by_exactly_one_shard(self):
+        nodes = make_nodes(600)
+        ring = HashRing(3)
+        slices = [ring.owned(nodes, shard) for shard in range(3)]
+
+        self.assertEqual(sum(len(owned) for owned in slices), len(nodes))
+        for owned in slices:
+            self.assertGreater(len(owned), 100)
+
+    def test_adding_a_shard_moves_few_nodes(self):
+        nodes = make_nodes(600)
+        before = HashRing(4)
+        after = HashRing(5)
+
+        moved = sum(
+            1 for node in nodes
+            if before.shard_for(node["host"], node["port"]) != after.shard_for(node["host"], node["port"])
+        )
+        self.assertLess(moved, len(nodes) * 0.35)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+
+from app.config import Config
+from app.scheduler import CollectionScheduler, ScrapeSnapshot
+from app.shared_snapshot import SharedSnapshotStore
+
+
+class FakeSentinel:
+    sentinel_name = "prod"
+    sentinel_status = []
+    last_scrape_success = True
+    last_scrape_duration = 0.1
+    last_scrape_error = ""
+    last_owned_nodes = 1
+
+    def __init__(self):
+        self.calls = 0
+
+    def collect_all_redis_info(self, deadline=None):
+        self.calls += 1
+        return {"127.0.0.1:6379": {"up": 1, "master_name": "mymaster", "node_role": "master"}}
+
+    def pool_stats(self):
+        return [{"host": "127.0.0.1", "port": 6379, "in_use": 0, "idle": 2}]
+
+    def breaker_stats(self):
+        return []
+
+
+class SharedSnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        if not SharedSnapshotStore.available():
+            self.skipTest("fcntl is not available")
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        Config._config = None
+        Config._config_path = None
+
+    def test_only_one_store_leads_and_followers_read_snapshot(self):
+        leader = SharedSnapshotStore(self.temp_dir.name)
+        follower = SharedSnapshotStore(self.temp_dir.name)
+        try:
+            self.assertTrue(leader.try_lead("prod"))
+            self.assertFalse(follower.try_lead("prod"))
+            self.assertIsNone(follower.read("prod", ScrapeSnapshot))
+
+            leader.write(ScrapeSnapshot("prod", {"10.0.0.1:6379": {"up": 1}}, True, 0.2, collected_at=100.0))
+            first = follower.read("prod", ScrapeSnapshot)
+            second = follower.read("prod", ScrapeSnapshot)
+            self.assertIs(first, second)
+            self.assertEqual(first.redis_info, {"10.0.0.1:6379": {"up": 1}})
+            self.assertEqual(first.collected_at, 100.0)
+
+            leader.close()
+            self.assertTrue(follower.try_lead("prod"))
+        finally:
+            leader.close()
+            follower.close()
+
+    def test_follower_scheduler_does_not_collect(self):
+        Config._config = Config._validate_config(
+            {"metrics": {"collect_interval": 60, "shared_snapshot_dir": self.temp_dir.name}}
+        )
+        leader, follower = CollectionScheduler(), CollectionScheduler()
+        leader_sentinel, follower_sentinel = FakeSentinel(), FakeSentinel()
+        try:
+            collected = leader.get_snapshot(leader_sentinel)
+            shared = follower.get_snapshot(follower_sentinel)
+            self.assertIsNone(leader.shared_snapshot("prod"))
+            self.assertIs(follower.shared_snapshot("prod"), shared)
+        finally:
+            leader.stop()
+            follower.stop()
+            leader._store.close()
+
+        self.assertEqual(leader_sentinel.calls, 1)
+        self.assertEqual(follower_sentinel.calls, 0)
+        self.assertEqual(shared.redis_info, collected.redis_info)
+        self.assertEqual(shared.collected_at, collected.collected_at)
+        self.assertEqual(shared.live_stats["pool"], leader_sentinel.pool_stats())
+        self.assertEqual(shared.live_stats["coalesced"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
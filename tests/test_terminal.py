@@ -0,0 +1,84 @@
+import unittest
+
+from app.terminal import BoundedOutput, cursor_reply, format_redis_result, iter_result_lines, needs_cursor
+
+
+class FakeRedisClient:
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def llen(self, key):
+        self.calls.append(("LLEN", key))
+        return len(self.items)
+
+    def execute_command(self, command, key, start, stop, *extra):
+        self.calls.append((command, key, start, stop))
+        return self.items[start:stop + 1]
+
+    def scan_iter(self, match=None, count=None):
+        self.calls.append(("SCAN", match, count))
+        return iter(self.items)
+
+
+class TerminalOutputTest(unittest.TestCase):
+    def test_format_matches_redis_cli_layout(self):
+        self.assertEqual(format_redis_result(None), "(nil)")
+        self.assertEqual(format_redis_result([]), "(empty list or set)")
+        self.assertEqual(format_redis_result(["a", ["b", 1]]), "1) a\n2)\n   1) b\n   2) 1")
+        self.assertEqual(format_redis_result({"f": "v"}), "f: v")
+
+    def test_bounded_output_stops_consuming_lines(self):
+        consumed = []
+
+        def lines():
+            for index in range(1000000):
+                consumed.append(index)
+                yield "x" * 10
+
+        output = BoundedOutput(lines(), 25)
+        text = output.text()
+
+        self.assertTrue(output.truncated)
+        self.assertTrue(text.startswith("xxxxxxxxxx\nxxxxxxxxxx\nxxx"))
+        self.assertTrue(text.endswith("... output truncated ..."))
+        self.assertEqual(len(consumed), 3)
+
+    def test_lrange_is_read_in_pages(self):
+        client = FakeRedisClient([str(index) for index in range(5)])
+
+        reply = cursor_reply(client, ["LRANGE", "big", "0", "-1"], page_size=2)
+        lines = list(iter_result_lines(reply))
+
+        self.assertEqual(lines, ["1) 0", "2) 1", "3) 2", "4) 3", "5) 4"])
+        self.assertEqual(
+            client.calls,
+            [("LLEN", "big"), ("LRANGE", "big", 0, 1), ("LRANGE", "big", 2, 3), ("LRANGE", "big", 4, 4)],
+        )
+
+    def test_keys_uses_scan_and_other_commands_pass_through(self):
+        client = FakeRedisClient(["k1"])
+
+        reply = cursor_reply(client, ["KEYS", "user:*"])
+
+        self.assertEqual(format_redis_result(reply), "1) k1")
+        self.assertEqual(client.calls[0][:2], ("SCAN", "user:*"))
+        self.assertIsNone(cursor_reply(client, ["GET", "k1"]))
+        self.assertIsNone(cursor_reply(client, ["ZRANGE", "z", "0", "10", "BYSCORE"]))
+
+    def test_bounded_range_is_not_rewritten(self):
+        client = FakeRedisClient(["a", "b", "c"])
+
+        self.assertIsNone(cursor_reply(client, ["LRANGE", "small", "0", "1"]))
+        self.assertEqual(client.calls, [])
+
+    def test_needs_cursor_flags_unbounded_commands(self):
+        self.assertTrue(needs_cursor(["KEYS", "*"]))
+        self.assertTrue(needs_cursor(["HGETALL", "h"]))
+        self.assertTrue(needs_cursor(["LRANGE", "l", "0", "-1"]))
+        self.assertFalse(needs_cursor(["LRANGE", "l", "0", "9"]))
+        self.assertFalse(needs_cursor(["GET", "k"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from app.topology import TopologySnapshot
+
+
+def make_topology():
+    return TopologySnapshot(
+        {"mymaster": {"name": "mymaster", "ip": "10.0.0.1", "port": 6379}},
+        {"mymaster": [{"ip": "10.0.0.2", "port": 6379, "flags": "slave", "is_disconnected": False}]},
+        built_at=100,
+    )
+
+
+class TopologySnapshotTest(unittest.TestCase):
+    def test_switch_master_promotes_replica(self):
+        topology = make_topology().apply_event("+switch-master", "mymaster 10.0.0.1 6379 10.0.0.2 6379")
+
+        self.assertEqual(topology.built_at, 100)
+        self.assertEqual(
+            [(node["host"], node["node_role"]) for node in topology.nodes],
+            [("10.0.0.2", "master")],
+        )
+
+    def test_replica_sdown_and_recovery(self):
+        down = make_topology().apply_event("+sdown", "slave 10.0.0.2:6379 10.0.0.2 6379 @ mymaster 10.0.0.1 6379")
+        self.assertEqual(down.slaves["mymaster"], [])
+
+        added = down.apply_event("+slave", "slave 10.0.0.3:6379 10.0.0.3 6379 @ mymaster 10.0.0.1 6379")
+        self.assertEqual([slave["ip"] for slave in added.slaves["mymaster"]], ["10.0.0.3"])
+
+    def test_unknown_master_requires_full_refresh(self):
+        topology = make_topology()
+
+        self.assertIsNone(topology.apply_event("+switch-master", "other 10.0.0.1 6379 10.0.0.2 6379"))
+        self.assertIsNone(topology.apply_event("+monitor", "master new 10.0.0.9 6379 quorum 2"))
+        self.assertIs(topology.apply_event("+sdown", "sentinel 10.0.0.8:26379 10.0.0.8 26379 @ mymaster 10.0.0.1 6379"), topology)
+
+
+if __name__ == "__main__":
+    unittest.main()